@@ -6,20 +6,42 @@ Fetches live aircraft data from api.adsb.lol with local caching
 import asyncio
 import aiohttp
 import json
+import logging
 import time
 import math
-from typing import List, Dict, Any, Optional, Tuple
+from functools import lru_cache
+from types import MappingProxyType
+from typing import List, Dict, Any, Mapping, Optional, Tuple
 from datetime import datetime
 from adsb_data import Aircraft
 
+logger = logging.getLogger(__name__)
+
+# Handle simdjson import with fallback
+try:
+    import simdjson
+    SIMDJSON_AVAILABLE = True
+except ImportError:
+    SIMDJSON_AVAILABLE = False
+
+# Without simdjson, prefer orjson over the stdlib parser
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
 # API Configuration
 API_BASE_URL = "https://api.adsb.lol/v2"
 DEFAULT_RADIUS = 25  # nautical miles
 CACHE_DURATION = 5  # seconds - how long to cache data
 REQUEST_TIMEOUT = 10  # seconds
+KEEPALIVE_TIMEOUT = 60  # seconds - how long idle API connections are kept open
+DNS_CACHE_TTL = 300  # seconds - how long resolved API hostnames are reused
+MAX_CONNECTIONS_PER_HOST = 8  # concurrent connections to the API host
 
-# Known airport coordinates
-AIRPORTS = {
+# Known airport coordinates (read-only, shared by every session)
+AIRPORTS = MappingProxyType({
     'RDU': {'lat': 35.877602, 'lon': -78.787498, 'name': 'Raleigh-Durham International'},
     'CLT': {'lat': 35.214, 'lon': -80.943, 'name': 'Charlotte Douglas International'},
     'ATL': {'lat': 33.6407, 'lon': -84.4277, 'name': 'Hartsfield-Jackson Atlanta'},
@@ -30,7 +52,7 @@ AIRPORTS = {
     'DFW': {'lat': 32.8998, 'lon': -97.0403, 'name': 'Dallas/Fort Worth International'},
     'DEN': {'lat': 39.8561, 'lon': -104.6737, 'name': 'Denver International'},
     'SFO': {'lat': 37.6213, 'lon': -122.3790, 'name': 'San Francisco International'},
-}
+})
 
 
 class ADSBApiClient:
@@ -40,10 +62,24 @@ class ADSBApiClient:
         self.cache: Dict[str, Tuple[float, List[Aircraft]]] = {}
         self.session: Optional[aiohttp.ClientSession] = None
         self._lock = asyncio.Lock()
+        # Fetches in progress, so concurrent callers for a location share one request
+        self._inflight: Dict[str, asyncio.Future] = {}
+        # Reusable parser; proxies only materialize the fields we read
+        self._parser = simdjson.Parser() if SIMDJSON_AVAILABLE else None
     
     async def __aenter__(self):
         """Async context manager entry"""
-        self.session = aiohttp.ClientSession()
+        # Keep connections (and their TLS sessions) alive between polls so
+        # each refresh doesn't pay for a new handshake
+        connector = aiohttp.TCPConnector(
+            limit_per_host=MAX_CONNECTIONS_PER_HOST,
+            keepalive_timeout=KEEPALIVE_TIMEOUT,
+            ttl_dns_cache=DNS_CACHE_TTL,
+        )
+        self.session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT),
+        )
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
@@ -69,29 +105,58 @@ class ADSBApiClient:
         """
         cache_key = self._get_cache_key(lat, lon, radius)
         
+        # The lock only guards the cache and in-flight table, not the request
         async with self._lock:
             # Check cache first
             if cache_key in self.cache:
                 timestamp, aircraft_list = self.cache[cache_key]
                 if time.time() - timestamp < CACHE_DURATION:
-                    print(f"Cache hit for {cache_key}")
+                    logger.debug("Cache hit for %s", cache_key)
                     return aircraft_list
             
-            # Fetch from API
+            # Join a fetch that is already running for this location
+            pending = self._inflight.get(cache_key)
+            is_fetcher = pending is None
+            if is_fetcher:
+                pending = asyncio.get_running_loop().create_future()
+                self._inflight[cache_key] = pending
+        
+        if not is_fetcher:
             try:
-                aircraft_list = await self._fetch_from_api(lat, lon, radius)
-                # Update cache
-                self.cache[cache_key] = (time.time(), aircraft_list)
-                print(f"Fetched {len(aircraft_list)} aircraft from API")
+                return await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                if pending.cancelled():
+                    # The caller doing the fetch was cancelled, try again
+                    return await self.get_aircraft(lat, lon, radius)
+                raise
+        
+        try:
+            aircraft_list = await self._refresh(cache_key, lat, lon, radius)
+        except BaseException:
+            pending.cancel()
+            raise
+        finally:
+            del self._inflight[cache_key]
+        
+        pending.set_result(aircraft_list)
+        return aircraft_list
+    
+    async def _refresh(self, cache_key: str, lat: float, lon: float, radius: int) -> List[Aircraft]:
+        """Fetch a location from the API and cache it, falling back to expired data on errors"""
+        try:
+            aircraft_list = await self._fetch_from_api(lat, lon, radius)
+            # Update cache
+            self.cache[cache_key] = (time.time(), aircraft_list)
+            logger.debug("Fetched %d aircraft from API", len(aircraft_list))
+            return aircraft_list
+        except Exception as e:
+            logger.warning("Error fetching from API: %s", e)
+            # Return cached data even if expired
+            if cache_key in self.cache:
+                _, aircraft_list = self.cache[cache_key]
+                logger.warning("Returning expired cache data (%d aircraft)", len(aircraft_list))
                 return aircraft_list
-            except Exception as e:
-                print(f"Error fetching from API: {e}")
-                # Return cached data even if expired
-                if cache_key in self.cache:
-                    _, aircraft_list = self.cache[cache_key]
-                    print(f"Returning expired cache data ({len(aircraft_list)} aircraft)")
-                    return aircraft_list
-                return []
+            return []
     
     async def _fetch_from_api(self, lat: float, lon: float, radius: int) -> List[Aircraft]:
         """Fetch aircraft data from the API"""
@@ -99,86 +164,114 @@ class ADSBApiClient:
             raise RuntimeError("Session not initialized. Use 'async with ADSBApiClient()' context manager.")
         
         url = f"{API_BASE_URL}/lat/{lat}/lon/{lon}/dist/{radius}"
-        print(f"Fetching from: {url}")
+        logger.debug("Fetching from: %s", url)
         
-        async with self.session.get(url, timeout=REQUEST_TIMEOUT) as response:
+        async with self.session.get(url) as response:
             if response.status != 200:
                 raise Exception(f"API returned status {response.status}")
             
-            data = await response.json()
-            
-            if 'ac' not in data:
-                return []
-            
-            aircraft_list = []
-            for ac_data in data['ac']:
-                aircraft = self._parse_aircraft_data(ac_data)
-                if aircraft:
-                    aircraft_list.append(aircraft)
-            
-            return aircraft_list
+            raw = await response.read()
+        
+        if self._parser is None:
+            return self._parse_aircraft_list(_json_loads(raw))
+        
+        # The parser is shared by every fetch and can't parse again while its
+        # proxies are alive, so convert with no await in between and drop them
+        data = self._parser.parse(raw)
+        try:
+            return self._parse_aircraft_list(data)
+        finally:
+            del data
+    
+    def _parse_aircraft_list(self, data) -> List[Aircraft]:
+        """Convert a parsed API response into Aircraft objects"""
+        ac_list = data.get('ac')
+        if ac_list is None:
+            return []
+        
+        aircraft_list = []
+        for ac_data in ac_list:
+            aircraft = self._parse_aircraft_data(ac_data)
+            if aircraft:
+                aircraft_list.append(aircraft)
+        
+        return aircraft_list
     
     def _parse_aircraft_data(self, data: Dict[str, Any]) -> Optional[Aircraft]:
-        """Parse API aircraft data into Aircraft object"""
+        """Parse API aircraft data into Aircraft object
+        
+        Accepts either a plain dict or a simdjson object proxy; only ``get``
+        is used so untouched fields are never converted to Python objects.
+        """
         try:
             # Required fields
-            if 'hex' not in data:
+            hex_code = data.get('hex')
+            if hex_code is None:
                 return None
             
-            aircraft = Aircraft(data['hex'])
+            aircraft = Aircraft(hex_code)
             
             # Map API fields to Aircraft object
             update_data = {}
             
             # Position
-            if 'lat' in data and 'lon' in data:
-                update_data['lat'] = data['lat']
-                update_data['lon'] = data['lon']
+            lat = data.get('lat')
+            lon = data.get('lon')
+            if lat is not None and lon is not None:
+                update_data['lat'] = lat
+                update_data['lon'] = lon
             
             # Altitude
-            if 'alt_baro' in data:
-                if isinstance(data['alt_baro'], (int, float)):
-                    update_data['altitude'] = data['alt_baro']
-                elif data['alt_baro'] == 'ground':
-                    update_data['altitude'] = 0
-                    update_data['on_ground'] = True
+            alt_baro = data.get('alt_baro')
+            if isinstance(alt_baro, (int, float)):
+                update_data['altitude'] = alt_baro
+            elif alt_baro == 'ground':
+                update_data['altitude'] = 0
+                update_data['on_ground'] = True
             
             # Speed and heading
-            if 'gs' in data:
-                update_data['speed'] = data['gs']
-            if 'track' in data:
-                update_data['track'] = data['track']
-            elif 'true_heading' in data:
-                update_data['track'] = data['true_heading']
+            gs = data.get('gs')
+            if gs is not None:
+                update_data['speed'] = gs
+            track = data.get('track')
+            if track is None:
+                track = data.get('true_heading')
+            if track is not None:
+                update_data['track'] = track
             
             # Flight info
-            if 'flight' in data:
-                update_data['flight'] = data['flight'].strip()
-            if 'r' in data:
-                update_data['registration'] = data['r']
-            if 't' in data:
-                update_data['type'] = data['t']
+            flight = data.get('flight')
+            if flight is not None:
+                update_data['flight'] = flight.strip()
+            registration = data.get('r')
+            if registration is not None:
+                update_data['registration'] = registration
+            aircraft_type = data.get('t')
+            if aircraft_type is not None:
+                update_data['type'] = aircraft_type
             
             # Other fields
-            if 'squawk' in data:
-                update_data['squawk'] = data['squawk']
-            if 'baro_rate' in data:
-                update_data['vertical_rate'] = data['baro_rate']
+            squawk = data.get('squawk')
+            if squawk is not None:
+                update_data['squawk'] = squawk
+            baro_rate = data.get('baro_rate')
+            if baro_rate is not None:
+                update_data['vertical_rate'] = baro_rate
             
             # Update the aircraft object
             aircraft.update(update_data)
             
             return aircraft
             
-        except Exception as e:
-            print(f"Error parsing aircraft data: {e}")
+        except Exception:
+            logger.exception("Error parsing aircraft data")
             return None
     
     def get_airport_info(self, code: str) -> Optional[Dict[str, Any]]:
         """Get airport information by code"""
         return AIRPORTS.get(code.upper())
     
-    def list_airports(self) -> Dict[str, Dict[str, Any]]:
+    def list_airports(self) -> Mapping[str, Dict[str, Any]]:
         """Get all available airports"""
         return AIRPORTS
 
@@ -220,6 +313,12 @@ async def fetch_aircraft_near_airport(airport_code: str = 'RDU', radius: int = D
     return await client.get_aircraft(airport['lat'], airport['lon'], radius)
 
 
+@lru_cache(maxsize=128)
+def _cos_lat(lat: float) -> float:
+    """Cosine of a latitude in degrees, cached since map centers are airports"""
+    return math.cos(math.radians(lat))
+
+
 def calculate_bounds_from_point(lat: float, lon: float, radius_nm: int) -> Dict[str, float]:
     """
     Calculate map bounds from a center point and radius in nautical miles.
@@ -238,7 +337,7 @@ def calculate_bounds_from_point(lat: float, lon: float, radius_nm: int) -> Dict[
     # Longitude delta depends on latitude due to Earth's curvature
     # At the equator, 1 degree longitude ≈ 60 nautical miles
     # At higher latitudes, it's less
-    lon_delta = radius_nm / (60.0 * math.cos(math.radians(lat)))
+    lon_delta = radius_nm / (60.0 * _cos_lat(lat))
     
     # Add some padding to ensure all aircraft in the radius are visible
     padding = 1.2  # 20% padding
@@ -4,25 +4,47 @@ Handles fetching aircraft data from various ADS-B sources
 """
 
 import json
+import math
 import time
 import socket
+import asyncio
+import aiohttp
 import requests
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple
 import logging
+from collections import deque
 
 from config import ADSB_CONFIG, PROCESSING_CONFIG
 
+# Prefer orjson for the (potentially large) dump1090 documents
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Size of the spatial index cells used for bounds queries, in degrees
+INDEX_CELL_SIZE = 0.5
+
+# Aircraft processed between yields to the event loop in async updates
+PROCESS_CHUNK_SIZE = 64
+
 
 class Aircraft:
     """Represents a single aircraft with its current and historical data"""
     
+    __slots__ = ('icao', 'icao_hash', 'callsign', 'latitude', 'longitude', 'altitude',
+                 'ground_speed', 'track', 'vertical_rate', 'last_seen',
+                 'position_history', '_trail_end_lat')
+    
     def __init__(self, icao: str):
         self.icao = icao
+        self.icao_hash = hash(icao)  # stable per-aircraft value, e.g. for symbol choice
         self.callsign = ""
         self.latitude = None
         self.longitude = None
@@ -31,14 +53,20 @@ class Aircraft:
         self.track = None  # heading in degrees
         self.vertical_rate = None
         self.last_seen = datetime.now()
-        self.position_history = []  # List of (lat, lon, timestamp) tuples
+        # Recent (lat, lon, timestamp) tuples, oldest dropped automatically
+        self.position_history = deque(maxlen=PROCESSING_CONFIG.get('trail_length', 10))
+        # (lat, radians, cosine) of the last trail point, see distance_from_trail_end
+        self._trail_end_lat = (None, 0.0, 1.0)
         
-    def update(self, data: Dict):
-        """Update aircraft data from ADS-B message"""
+    def update(self, data: Dict) -> bool:
+        """Update aircraft data from ADS-B message, returning whether a displayed field changed"""
         self.last_seen = datetime.now()
+        get = data.get
+        changed = False
         
-        if 'lat' in data and 'lon' in data and data['lat'] and data['lon']:
-            new_lat, new_lon = float(data['lat']), float(data['lon'])
+        lat, lon = get('lat'), get('lon')
+        if lat and lon:
+            new_lat, new_lon = float(lat), float(lon)
             
             # Only update position if it's different (ensures unique trail points)
             if (self.latitude is None or self.longitude is None or
@@ -47,27 +75,65 @@ class Aircraft:
                 
                 self.latitude = new_lat
                 self.longitude = new_lon
+                changed = True
                 
                 # Add unique position to history
-                if not self.position_history or calculate_distance(self.position_history[-1][0], self.position_history[-1][1], new_lat, new_lon) > 0.1:
+                if not self.position_history or self.distance_from_trail_end(new_lat, new_lon) > 0.1:
                     self.position_history.append((new_lat, new_lon, self.last_seen))
-                
-                # Limit history length
-                max_history = PROCESSING_CONFIG.get('trail_length', 10)
-                if len(self.position_history) > max_history:
-                    self.position_history = self.position_history[-max_history:]
-        
-        # Update other attributes
-        if 'flight' in data and data['flight']:
-            self.callsign = data['flight'].strip()
-        if 'altitude' in data and data['altitude']:
-            self.altitude = int(data['altitude'])
-        if 'speed' in data and data['speed']:
-            self.ground_speed = int(data['speed'])
-        if 'track' in data and data['track']:
-            self.track = float(data['track'])
-        if 'vert_rate' in data and data['vert_rate']:
-            self.vertical_rate = int(data['vert_rate'])
+        
+        # Update other attributes (one lookup per field)
+        value = get('flight')
+        if value:
+            value = value.strip()
+            if value != self.callsign:
+                self.callsign = value
+                changed = True
+        value = get('altitude')
+        if value:
+            value = int(value)
+            if value != self.altitude:
+                self.altitude = value
+                changed = True
+        value = get('speed')
+        if value:
+            value = int(value)
+            if value != self.ground_speed:
+                self.ground_speed = value
+                changed = True
+        value = get('track')
+        if value:
+            value = float(value)
+            if value != self.track:
+                self.track = value
+                changed = True
+        value = get('vert_rate')
+        if value:
+            value = int(value)
+            if value != self.vertical_rate:
+                self.vertical_rate = value
+                changed = True
+        
+        return changed
+    
+    def distance_from_trail_end(self, lat: float, lon: float) -> float:
+        """Distance in nautical miles from the last trail point to a position
+        
+        Same result as calculate_distance, but the last trail point's radians
+        and cosine are cached, as it stays put across most updates.
+        """
+        end_lat, end_lon = self.position_history[-1][:2]
+        cached_lat, end_lat_r, end_cos_lat = self._trail_end_lat
+        if cached_lat != end_lat:
+            end_lat_r = math.radians(end_lat)
+            end_cos_lat = math.cos(end_lat_r)
+            self._trail_end_lat = (end_lat, end_lat_r, end_cos_lat)
+        
+        lat_r = math.radians(lat)
+        sin_dlat = math.sin((lat_r - end_lat_r) * 0.5)
+        sin_dlon = math.sin(math.radians(lon - end_lon) * 0.5)
+        a = sin_dlat * sin_dlat + end_cos_lat * math.cos(lat_r) * sin_dlon * sin_dlon
+        
+        return 2 * math.asin(math.sqrt(a)) * EARTH_RADIUS_NM
     
     def is_on_ground(self) -> bool:
         """Check if aircraft is on ground"""
@@ -91,6 +157,46 @@ class ADSBDataFetcher:
     def __init__(self):
         self.aircraft = {}  # Dict of ICAO -> Aircraft
         self.last_update = datetime.now()
+        # Spatial index of positioned aircraft: cell -> {ICAO -> Aircraft}
+        self._cells: Dict[Tuple[int, int], Dict[str, Aircraft]] = {}
+        self._cell_of: Dict[str, Tuple[int, int]] = {}  # ICAO -> cell
+        # Bumped only when an aircraft appears, changes or is dropped
+        self.data_version = 0
+        self._bounds_cache: Optional[Tuple[tuple, List[Aircraft]]] = None
+        # Last dump1090 response: (url, ETag, Last-Modified, parsed data)
+        self._last_response: Optional[Tuple[str, Optional[str], Optional[str], Dict]] = None
+    
+    @staticmethod
+    def _cell_key(lat: float, lon: float) -> Tuple[int, int]:
+        """Get the spatial index cell containing a position"""
+        return math.floor(lat / INDEX_CELL_SIZE), math.floor(lon / INDEX_CELL_SIZE)
+    
+    def _index_aircraft(self, aircraft: Aircraft):
+        """Move an aircraft to the index cell matching its current position"""
+        icao = aircraft.icao
+        old_key = self._cell_of.get(icao)
+        if aircraft.latitude is None or aircraft.longitude is None:
+            new_key = None
+        else:
+            new_key = self._cell_key(aircraft.latitude, aircraft.longitude)
+        
+        if new_key == old_key:
+            return
+        
+        if old_key is not None:
+            self._unindex_aircraft(icao)
+        if new_key is not None:
+            self._cells.setdefault(new_key, {})[icao] = aircraft
+            self._cell_of[icao] = new_key
+    
+    def _unindex_aircraft(self, icao: str):
+        """Remove an aircraft from the spatial index"""
+        key = self._cell_of.pop(icao, None)
+        if key is not None:
+            cell = self._cells[key]
+            del cell[icao]
+            if not cell:
+                del self._cells[key]
         
     def fetch_from_dump1090_json(self, url: str = None) -> bool:
         """Fetch data from dump1090 JSON interface"""
@@ -98,41 +204,131 @@ class ADSBDataFetcher:
             url = ADSB_CONFIG['dump1090_url']
         
         try:
-            response = requests.get(url, timeout=10)
-            response.raise_for_status()
-            data = response.json()
-            
-            if 'aircraft' in data:
-                self._process_aircraft_list(data['aircraft'])
-                return True
+            response = requests.get(url, headers=self._conditional_headers(url), timeout=10)
+            if response.status_code == 304:
+                data = self._last_response_data(url)
             else:
-                logger.warning(f"No aircraft data in response from {url}")
+                response.raise_for_status()
+                data = self._decode_dump1090_body(response.content, response.headers, url)
+            
+            aircraft_list = self._dump1090_aircraft(data, url)
+            if aircraft_list is None:
                 return False
+            self._process_aircraft_list(aircraft_list)
+            return True
                 
         except requests.RequestException as e:
             logger.error(f"Failed to fetch data from {url}: {e}")
             return False
-        except json.JSONDecodeError as e:
+        except ValueError as e:  # JSONDecodeError, or a body that isn't valid text
+            logger.error(f"Failed to parse JSON from {url}: {e}")
+            return False
+    
+    async def fetch_from_dump1090_json_async(self, session: aiohttp.ClientSession,
+                                             url: str = None) -> bool:
+        """Fetch data from dump1090 JSON interface without blocking the event loop"""
+        if url is None:
+            url = ADSB_CONFIG['dump1090_url']
+        
+        try:
+            async with session.get(url, headers=self._conditional_headers(url),
+                                   timeout=aiohttp.ClientTimeout(total=10)) as response:
+                if response.status == 304:
+                    data = self._last_response_data(url)
+                else:
+                    response.raise_for_status()
+                    body = await response.read()
+                    data = self._decode_dump1090_body(body, response.headers, url)
+            
+            aircraft_list = self._dump1090_aircraft(data, url)
+            if aircraft_list is None:
+                return False
+            await self._process_aircraft_list_async(aircraft_list)
+            return True
+                
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.error(f"Failed to fetch data from {url}: {e}")
+            return False
+        except ValueError as e:  # JSONDecodeError, or a body that isn't valid text
             logger.error(f"Failed to parse JSON from {url}: {e}")
             return False
     
+    def _conditional_headers(self, url: str) -> Dict[str, str]:
+        """Validators from the last response, so an unchanged feed can answer 304"""
+        headers = {}
+        last = self._last_response
+        if last is not None and last[0] == url:
+            if last[1]:
+                headers['If-None-Match'] = last[1]
+            if last[2]:
+                headers['If-Modified-Since'] = last[2]
+        return headers
+    
+    def _decode_dump1090_body(self, body: bytes, headers, url: str) -> Dict:
+        """Parse a dump1090 response body, keeping its validators for the next request"""
+        data = _json_loads(body)
+        self._last_response = (url, headers.get('ETag'), headers.get('Last-Modified'), data)
+        return data
+    
+    def _last_response_data(self, url: str) -> Optional[Dict]:
+        """Handle a 304 by returning the previously parsed data"""
+        last = self._last_response
+        if last is None or last[0] != url:
+            logger.warning(f"Unexpected 304 from {url} without cached data")
+            return None
+        return last[3]
+    
+    def _dump1090_aircraft(self, data: Optional[Dict], url: str) -> Optional[List[Dict]]:
+        """Get the aircraft list from a parsed dump1090 aircraft.json document"""
+        if data is None:
+            return None
+        if 'aircraft' in data:
+            return data['aircraft']
+        logger.warning(f"No aircraft data in response from {url}")
+        return None
+    
     def _process_aircraft_list(self, aircraft_list: List[Dict]):
         """Process a list of aircraft data"""
+        for _ in self._iter_process_aircraft_list(aircraft_list):
+            pass
+    
+    async def _process_aircraft_list_async(self, aircraft_list: List[Dict]):
+        """Process a list of aircraft data, letting other tasks run between chunks"""
+        for _ in self._iter_process_aircraft_list(aircraft_list):
+            await asyncio.sleep(0)
+    
+    def _iter_process_aircraft_list(self, aircraft_list: List[Dict]):
+        """Process a list of aircraft data, yielding after every PROCESS_CHUNK_SIZE aircraft
+        
+        Stale aircraft are removed and data_version is bumped only once the
+        whole list has been processed.
+        """
         current_time = datetime.now()
         seen_aircraft = set()
+        tracked = self.aircraft
+        index_aircraft = self._index_aircraft
+        changed = False
         
-        for aircraft_data in aircraft_list:
-            if 'hex' not in aircraft_data:
+        for count, aircraft_data in enumerate(aircraft_list, 1):
+            if count % PROCESS_CHUNK_SIZE == 0:
+                yield
+            
+            icao = aircraft_data.get('hex')
+            if icao is None:
                 continue
                 
-            icao = aircraft_data['hex'].upper()
+            icao = icao.upper()
             seen_aircraft.add(icao)
             
             # Create or update aircraft
-            if icao not in self.aircraft:
-                self.aircraft[icao] = Aircraft(icao)
+            aircraft = tracked.get(icao)
+            if aircraft is None:
+                aircraft = tracked[icao] = Aircraft(icao)
+                changed = True
             
-            self.aircraft[icao].update(aircraft_data)
+            if aircraft.update(aircraft_data):
+                changed = True
+            index_aircraft(aircraft)
         
         # Clean up old aircraft
         timeout = timedelta(seconds=ADSB_CONFIG['cleanup_timeout'])
@@ -144,30 +340,61 @@ class ADSBDataFetcher:
         
         for icao in to_remove:
             del self.aircraft[icao]
+            self._unindex_aircraft(icao)
             logger.info(f"Removed stale aircraft {icao}")
+        
+        if changed or to_remove:
+            self.data_version += 1
     
     def get_aircraft_in_bounds(self, lat_min: float, lat_max: float, 
                              lon_min: float, lon_max: float) -> List[Aircraft]:
         """Get aircraft within specified geographic bounds"""
+        # Read the filters once instead of once per aircraft
+        filter_ground = PROCESSING_CONFIG['filter_ground']
+        min_altitude = PROCESSING_CONFIG['min_altitude']
+        max_altitude = PROCESSING_CONFIG['max_altitude']
+        
+        # Reuse the last result if neither the query nor the data changed
+        key = (lat_min, lat_max, lon_min, lon_max, filter_ground,
+               min_altitude, max_altitude, self.data_version)
+        cached = self._bounds_cache
+        if cached is not None and cached[0] == key:
+            return list(cached[1])
+        
+        # Only visit index cells overlapping the bounds, unless the bounds
+        # cover more cells than are occupied
+        row_min, col_min = self._cell_key(lat_min, lon_min)
+        row_max, col_max = self._cell_key(lat_max, lon_max)
+        if (row_max - row_min + 1) * (col_max - col_min + 1) > len(self._cells):
+            cells = [cell for (row, col), cell in self._cells.items()
+                     if row_min <= row <= row_max and col_min <= col <= col_max]
+        else:
+            cells = [self._cells[key]
+                     for key in ((row, col) for row in range(row_min, row_max + 1)
+                                 for col in range(col_min, col_max + 1))
+                     if key in self._cells]
+        
         result = []
         
-        for aircraft in self.aircraft.values():
-            if (aircraft.latitude is not None and aircraft.longitude is not None and
-                lat_min <= aircraft.latitude <= lat_max and
-                lon_min <= aircraft.longitude <= lon_max):
-                
-                # Apply filters
-                if PROCESSING_CONFIG['filter_ground'] and aircraft.is_on_ground():
+        for aircraft in (aircraft for cell in cells for aircraft in cell.values()):
+            lat = aircraft.latitude
+            lon = aircraft.longitude
+            if (lat is None or lon is None or
+                not (lat_min <= lat <= lat_max and lon_min <= lon <= lon_max)):
+                continue
+            
+            # Apply filters (same ground threshold as Aircraft.is_on_ground)
+            altitude = aircraft.altitude
+            if altitude is not None:
+                if filter_ground and altitude < 100:
                     continue
-                
-                if (aircraft.altitude is not None and 
-                    not (PROCESSING_CONFIG['min_altitude'] <= aircraft.altitude <= 
-                         PROCESSING_CONFIG['max_altitude'])):
+                if not (min_altitude <= altitude <= max_altitude):
                     continue
-                
-                result.append(aircraft)
+            
+            result.append(aircraft)
         
-        return result
+        self._bounds_cache = (key, result)
+        return list(result)
     
     def get_aircraft_count(self) -> int:
         """Get total number of tracked aircraft"""
@@ -183,27 +410,54 @@ class ADSBDataFetcher:
         # Could add fallback to other sources here
         logger.warning("Failed to update from any ADS-B source")
         return False
+    
+    async def update_async(self, session: aiohttp.ClientSession) -> bool:
+        """Update aircraft data from configured source, for use inside an event loop"""
+        if await self.fetch_from_dump1090_json_async(session):
+            self.last_update = datetime.now()
+            return True
+        
+        logger.warning("Failed to update from any ADS-B source")
+        return False
+
+
+# Earth radius in nautical miles
+EARTH_RADIUS_NM = 3440.065
 
 
 def calculate_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
     """Calculate distance between two points in nautical miles"""
-    import math
-    
     # Convert to radians
     lat1_r = math.radians(lat1)
-    lon1_r = math.radians(lon1)
     lat2_r = math.radians(lat2)
-    lon2_r = math.radians(lon2)
     
     # Haversine formula
-    dlat = lat2_r - lat1_r
-    dlon = lon2_r - lon1_r
+    sin_dlat = math.sin((lat2_r - lat1_r) * 0.5)
+    sin_dlon = math.sin(math.radians(lon2 - lon1) * 0.5)
+    
+    a = sin_dlat * sin_dlat + math.cos(lat1_r) * math.cos(lat2_r) * sin_dlon * sin_dlon
+    
+    return 2 * math.asin(math.sqrt(a)) * EARTH_RADIUS_NM
+
+
+def calculate_distances(lat: float, lon: float, lats: Sequence[float],
+                        lons: Sequence[float]) -> List[float]:
+    """Calculate distances from one point to many points in nautical miles
     
-    a = (math.sin(dlat / 2) ** 2 + 
-         math.cos(lat1_r) * math.cos(lat2_r) * math.sin(dlon / 2) ** 2)
-    c = 2 * math.asin(math.sqrt(a))
+    The reference point's radians and cosine are computed once for the whole
+    batch instead of once per pair.
+    """
+    radians, sin, cos, asin, sqrt = math.radians, math.sin, math.cos, math.asin, math.sqrt
+    lat_r = radians(lat)
+    cos_lat = cos(lat_r)
+    diameter = 2 * EARTH_RADIUS_NM
     
-    # Earth radius in nautical miles
-    r = 3440.065
+    distances = []
+    for lat2, lon2 in zip(lats, lons):
+        lat2_r = radians(lat2)
+        sin_dlat = sin((lat2_r - lat_r) * 0.5)
+        sin_dlon = sin(radians(lon2 - lon) * 0.5)
+        a = sin_dlat * sin_dlat + cos_lat * cos(lat2_r) * sin_dlon * sin_dlon
+        distances.append(diameter * asin(sqrt(a)))
     
-    return c * r
+    return distances
@@ -4,9 +4,13 @@ Converts aircraft positions to terminal-based ASCII art display
 """
 
 import os
+import re
+import sys
 import math
+import time
+import heapq
+from itertools import islice
 from typing import List, Tuple, Dict
-from datetime import datetime
 
 # Handle colorama import with fallback
 try:
@@ -33,7 +37,61 @@ except ImportError:
         pass
 
 from config import DISPLAY_CONFIG, ASCII_STYLES, DEFAULT_STYLE
-from adsb_data import Aircraft, calculate_distance
+from adsb_data import Aircraft, calculate_distances
+
+# Directional symbols indexed by 45 degree heading sector, starting at north
+HEADING_SYMBOLS = '^>>>v<<<'
+HEADING_CODES = HEADING_SYMBOLS.encode('latin-1')  # same, as grid codes
+
+# Grid code for trail points; a simple dot in every style for compatibility
+TRAIL_CODE = ord('.')
+
+# Speed-based symbol sets, one is picked per aircraft by ICAO hash
+FAST_SYMBOLS = ('*', '+', '#', '@')
+SLOW_SYMBOLS = ('o', '0', 'O', '.')
+MEDIUM_SYMBOLS = ('x', 'X', '*', '+')
+
+# Color names usable in DISPLAY_CONFIG, numbered from 1 (0 means no color)
+COLOR_NAMES = ('black', 'red', 'green', 'yellow', 'blue', 'magenta', 'cyan', 'white')
+COLOR_IDS = {name: index for index, name in enumerate(COLOR_NAMES, 1)}
+
+# ANSI color codes indexed by color id
+COLOR_CODES = ('', Fore.BLACK, Fore.RED, Fore.GREEN, Fore.YELLOW,
+               Fore.BLUE, Fore.MAGENTA, Fore.CYAN, Fore.WHITE)
+
+# Escape sequence to emit between a run of one color id and the next,
+# indexed [previous][next]: switching colors only sets the new foreground,
+# a reset is only needed when going back to uncolored cells
+COLOR_TRANSITIONS = tuple(
+    tuple(COLOR_CODES[nxt] if nxt else (Style.RESET_ALL if prev else '')
+          for nxt in range(len(COLOR_CODES)))
+    for prev in range(len(COLOR_CODES))
+)
+
+
+# Cursor home followed by erase display
+CLEAR_SCREEN = '\x1b[H\x1b[2J'
+
+# Matches a run of identical bytes, used to split a color row into runs
+COLOR_RUN_RE = re.compile(rb'(.)\1*', re.DOTALL)
+
+
+# Last formatted UTC clock as [epoch second, 'HH:MM:SS'], shared by all renderers
+_utc_clock_cache = [None, '']
+
+
+def utc_clock() -> str:
+    """Get the current UTC time as HH:MM:SS, formatted at most once per second"""
+    now = int(time.time())
+    if now != _utc_clock_cache[0]:
+        _utc_clock_cache[0] = now
+        _utc_clock_cache[1] = time.strftime('%H:%M:%S', time.gmtime(now))
+    return _utc_clock_cache[1]
+
+
+def char_code(char: str) -> int:
+    """Get the single-byte grid code for a character ('?' if it has none)"""
+    return char.encode('latin-1', 'replace')[0]
 
 
 class ASCIIRenderer:
@@ -42,15 +100,13 @@ class ASCIIRenderer:
     def __init__(self, style: str = DEFAULT_STYLE):
         self.style = style
         self.ascii_style = ASCII_STYLES.get(style, ASCII_STYLES[DEFAULT_STYLE])
-        # Get current terminal dimensions from DISPLAY_CONFIG
-        self.terminal_width = DISPLAY_CONFIG.get('terminal_width', 80)
-        # Reserve space for the info panel
-        self.full_terminal_height = DISPLAY_CONFIG.get('terminal_height', 25)
         self.info_panel_height = 14  # Reduced height for the info panel (was 22)
-
-        # Calculate map height, ensuring it's not negative
-        self.map_height = self.full_terminal_height - self.info_panel_height
-        if self.map_height < 5: self.map_height = 5
+        self._bg_code = char_code(self.ascii_style['background'])
+        self._bg_run_re = re.compile(re.escape(bytes([self._bg_code])) + b'+')
+        
+        # Get current terminal dimensions from DISPLAY_CONFIG
+        self._set_size(DISPLAY_CONFIG.get('terminal_width', 80),
+                       DISPLAY_CONFIG.get('terminal_height', 25))
 
         self.map_bounds = DISPLAY_CONFIG.get('map_bounds', {
             'lat_min': 40.0,
@@ -59,228 +115,332 @@ class ASCIIRenderer:
             'lon_max': -73.0,
         })
         
-        # Create grid for rendering using the calculated map_height
-        self.grid = [[' ' for _ in range(self.terminal_width)] 
-                     for _ in range(self.map_height)]
-        self.color_grid = [[None for _ in range(self.terminal_width)] 
-                          for _ in range(self.map_height)]
+        # Aircraft color by altitude in 100 ft steps: ground below 100 ft,
+        # low below 10,000 ft, medium below 30,000 ft, high above, with the
+        # last entry used when the altitude is unknown
+        colors = DISPLAY_CONFIG['colors']
+        self._altitude_colors = ((colors['ground'],) +
+                                 (colors['altitude_low'],) * 99 +
+                                 (colors['altitude_med'],) * 200 +
+                                 (colors['altitude_high'], colors['aircraft']))
+        self._altitude_color_ids = tuple(COLOR_IDS.get(color, 0) for color in self._altitude_colors)
+        self._border_color_id = COLOR_IDS.get(colors['border'], 0)
+        self._airport_color_id = COLOR_IDS['white']
         
-        # Track cells reserved for airport symbol and name
-        self.airport_cells = set()
+        self.reload_config()
         
         # Log the dimensions being used
         print(f"ASCIIRenderer initialized with terminal_width={self.terminal_width}, "
               f"full_terminal_height={self.full_terminal_height}, map_height={self.map_height}")
         
+    def _set_size(self, terminal_width: int, terminal_height: int):
+        """Set the terminal dimensions and allocate the grids to match"""
+        self.terminal_width = terminal_width
+        # Reserve space for the info panel
+        self.full_terminal_height = terminal_height
+
+        # Calculate map height, ensuring it's not negative
+        self.map_height = self.full_terminal_height - self.info_panel_height
+        if self.map_height < 5: self.map_height = 5
+        
+        # Create grid for rendering using the calculated map_height. Both
+        # grids are flat row-major buffers indexed by y * width + x: one byte
+        # per cell holding a latin-1 character code or a color id.
+        cell_count = self.terminal_width * self.map_height
+        self._blank_grid = bytes([self._bg_code]) * cell_count
+        self._blank_colors = bytes(cell_count)
+        self.grid = bytearray(self._blank_grid)
+        self.color_grid = bytearray(self._blank_colors)
+        
+        # Cells reserved for airport symbol and name, nonzero when reserved
+        self.airport_mask = bytearray(cell_count)
+    
+    def resize(self, terminal_width: int, terminal_height: int):
+        """Adapt the renderer to a new terminal size
+        
+        Only the grids are reallocated; the style, color tables, cached
+        settings and map bounds are kept.
+        """
+        if terminal_width == self.terminal_width and terminal_height == self.full_terminal_height:
+            return
+        self._set_size(terminal_width, terminal_height)
+        # Grid cells per degree depend on the map size
+        self.map_bounds = self._map_bounds
+        
+        print(f"ASCIIRenderer resized to terminal_width={self.terminal_width}, "
+              f"full_terminal_height={self.full_terminal_height}, map_height={self.map_height}")
+    
+    def reload_config(self):
+        """Read the per-frame display settings from DISPLAY_CONFIG
+        
+        They are cached on the renderer rather than looked up every frame;
+        call this again after changing them.
+        """
+        self._show_trails = DISPLAY_CONFIG['show_trails']
+        self._use_headings = DISPLAY_CONFIG.get('use_unicode_symbols', False)
+        self._display_mode = DISPLAY_CONFIG.get('display_mode', 'all')
+        self._demo_mode = DISPLAY_CONFIG.get('demo_mode', False)
+        self._airport_code = DISPLAY_CONFIG.get('airport', 'RDU')
+        self._aircraft_limit = DISPLAY_CONFIG.get('display_aircraft_limit', 5)
+    
     def clear_grid(self):
         """Clear the rendering grid"""
-        bg_char = self.ascii_style['background']
-        for y in range(self.map_height):
-            for x in range(self.terminal_width):
-                self.grid[y][x] = bg_char
-                self.color_grid[y][x] = None
+        self.grid[:] = self._blank_grid
+        self.color_grid[:] = self._blank_colors
+    
+    @property
+    def map_bounds(self) -> Dict[str, float]:
+        """Geographic bounds of the map area"""
+        return self._map_bounds
+    
+    @map_bounds.setter
+    def map_bounds(self, bounds: Dict[str, float]):
+        """Set the map bounds and precompute the projection constants"""
+        self._map_bounds = bounds
+        self._lat_min = bounds['lat_min']
+        self._lon_min = bounds['lon_min']
+        # Grid cells per degree
+        self._y_scale = (self.map_height - 1) / (bounds['lat_max'] - bounds['lat_min'])
+        self._x_scale = (self.terminal_width - 1) / (bounds['lon_max'] - bounds['lon_min'])
     
     def lat_lon_to_grid(self, latitude: float, longitude: float) -> Tuple[int, int]:
         """Convert latitude/longitude to grid coordinates"""
-        bounds = self.map_bounds
-        
-        lat_norm = (latitude - bounds['lat_min']) / (bounds['lat_max'] - bounds['lat_min'])
-        lon_norm = (longitude - bounds['lon_min']) / (bounds['lon_max'] - bounds['lon_min'])
-        
-        x = int(lon_norm * (self.terminal_width - 1))
-        y = int((1 - lat_norm) * (self.map_height - 1))
+        x = int((longitude - self._lon_min) * self._x_scale)
+        y = int((self.map_height - 1) - (latitude - self._lat_min) * self._y_scale)
         
         x = max(0, min(self.terminal_width - 1, x))
         y = max(0, min(self.map_height - 1, y))
         
         return x, y
     
+    def project_batch(self, latitudes: List[float], longitudes: List[float]) -> Tuple[List[int], List[int]]:
+        """Convert many latitude/longitude pairs to clamped grid coordinates at once"""
+        lat_min, y_scale = self._lat_min, self._y_scale
+        lon_min, x_scale = self._lon_min, self._x_scale
+        x_max = self.terminal_width - 1
+        y_max = self.map_height - 1
+        
+        xs = [min(x_max, max(0, int((lon - lon_min) * x_scale))) for lon in longitudes]
+        ys = [min(y_max, max(0, int(y_max - (lat - lat_min) * y_scale))) for lat in latitudes]
+        
+        return xs, ys
+    
     def get_aircraft_symbol(self, aircraft: Aircraft) -> str:
         """Get the appropriate symbol for an aircraft based on properties"""
         # Check if we should use Unicode directional symbols
-        if DISPLAY_CONFIG.get('use_unicode_symbols', False) and aircraft.track is not None:
-            # Try different sets of directional symbols
-            heading = aircraft.track
-            
-            # Option 1: Arrow symbols (most compatible)
-            if 337.5 <= heading or heading < 22.5:
-                return '^'  # North
-            elif 22.5 <= heading < 67.5:
-                return '>'  # Northeast (simplified)
-            elif 67.5 <= heading < 112.5:
-                return '>'  # East
-            elif 112.5 <= heading < 157.5:
-                return '>'  # Southeast (simplified)
-            elif 157.5 <= heading < 202.5:
-                return 'v'  # South
-            elif 202.5 <= heading < 247.5:
-                return '<'  # Southwest (simplified)
-            elif 247.5 <= heading < 292.5:
-                return '<'  # West
-            elif 292.5 <= heading < 337.5:
-                return '<'  # Northwest (simplified)
+        if self._use_headings and aircraft.track is not None:
+            # Arrow symbols (most compatible), diagonals collapse to E/W
+            return HEADING_SYMBOLS[int((aircraft.track % 360 + 22.5) // 45) & 7]
         
         # Fallback to ASCII symbols based on speed
-        if aircraft.ground_speed and aircraft.ground_speed > 400:
-            # Fast aircraft symbols
-            symbols = ['*', '+', '#', '@']
-        elif aircraft.ground_speed and aircraft.ground_speed < 200:
-            # Slow aircraft symbols  
-            symbols = ['o', '0', 'O', '.']
+        speed = aircraft.ground_speed
+        if speed and speed > 400:
+            symbols = FAST_SYMBOLS
+        elif speed and speed < 200:
+            symbols = SLOW_SYMBOLS
         else:
-            # Medium speed aircraft symbols
-            symbols = ['x', 'X', '*', '+']
+            symbols = MEDIUM_SYMBOLS
         
         # Use ICAO hash to consistently assign symbol to each aircraft
         if aircraft.icao:
-            symbol_index = hash(aircraft.icao) % len(symbols)
-            return symbols[symbol_index]
+            return symbols[aircraft.icao_hash % len(symbols)]
         
         return 'x'  # Default fallback
     
+    def _altitude_bin(self, aircraft: Aircraft) -> int:
+        """Get the aircraft's index into the altitude color tables"""
+        altitude = aircraft.altitude
+        if altitude is None:
+            return -1
+        return min(300, max(0, int(altitude) // 100))
+    
     def get_aircraft_color(self, aircraft: Aircraft) -> str:
         """Get color for aircraft based on altitude"""
-        colors = DISPLAY_CONFIG['colors']
-        
-        if aircraft.is_on_ground():
-            return colors['ground']
-        
-        alt_category = aircraft.get_altitude_category()
-        color_map = {
-            'low': colors['altitude_low'],
-            'med': colors['altitude_med'],
-            'high': colors['altitude_high'],
-        }
-        
-        return color_map.get(alt_category, colors['aircraft'])
+        return self._altitude_colors[self._altitude_bin(aircraft)]
     
-    def render_aircraft_trails(self, aircraft: Aircraft):
+    def render_aircraft_trails(self, aircraft: Aircraft, color_id: int = None):
         """Render position history trails for an aircraft"""
-        if not DISPLAY_CONFIG['show_trails'] or not aircraft.position_history:
+        if color_id is None:
+            color_id = self._altitude_color_ids[self._altitude_bin(aircraft)]
+        self.render_trails([aircraft], [color_id])
+    
+    def render_trails(self, aircraft_list: List[Aircraft], color_ids: List[int]):
+        """Render position history trails for many aircraft with one projection
+        
+        Earlier aircraft in the list win cells their trails share.
+        """
+        if not self._show_trails:
             return
         
-        trail_char = '.'  # Use simple dot for trail compatibility
+        latitudes, longitudes, colors = self._trail_points(aircraft_list, color_ids)
+        empty_codes = (self._bg_code, ord(' '))
+        width = self.terminal_width
+        
+        xs, ys = self.project_batch(latitudes, longitudes)
+        for x, y, color_id in zip(xs, ys, colors):
+            # Only render if cell is empty or has background AND not reserved for airport
+            cell = y * width + x
+            if not self.airport_mask[cell] and self.grid[cell] in empty_codes:
+                self.grid[cell] = TRAIL_CODE
+                self.color_grid[cell] = color_id
+    
+    def _trail_points(self, aircraft_list: List[Aircraft], color_ids: List[int]) -> Tuple[List[float], List[float], List[int]]:
+        """Get the trail points of many aircraft as latitude, longitude and color columns"""
+        # All trail points except each aircraft's current position
+        latitudes, longitudes, colors = [], [], []
+        for aircraft, color_id in zip(aircraft_list, color_ids):
+            history = aircraft.position_history
+            count = len(history) - 1
+            if count > 0:
+                latitudes.extend(point[0] for point in islice(history, count))
+                longitudes.extend(point[1] for point in islice(history, count))
+                colors.extend((color_id,) * count)
+        return latitudes, longitudes, colors
+    
+    def _reserve_airport_cells(self, x: int, y: int, code: str) -> bool:
+        """Mark the airport marker cell and the code label above it as reserved
+        
+        Returns whether the code label fits on the map.
+        """
+        # Clear previous airport cells tracking
+        self.airport_mask[:] = self._blank_colors
         
-        # Render all trail points except the current position
-        for i, (lat, lon, timestamp) in enumerate(aircraft.position_history[:-1]):
-            x, y = self.lat_lon_to_grid(lat, lon)
-            if 0 <= x < self.terminal_width and 0 <= y < self.map_height:
-                # Only render if cell is empty or has background AND not reserved for airport
-                if (x, y) not in self.airport_cells and self.grid[y][x] in [self.ascii_style['background'], ' ']:
-                    self.grid[y][x] = trail_char
-                    aircraft_color = self.get_aircraft_color(aircraft)
-                    self.color_grid[y][x] = aircraft_color
+        if not (0 <= x < self.terminal_width and 0 <= y < self.map_height):
+            return False
+        
+        cell = y * self.terminal_width + x
+        self.airport_mask[cell] = 1
+        
+        # The code goes above the airport marker if there is room
+        code = code[:3]  # Limit to 3 chars
+        if y > 0 and x - 1 >= 0 and x + len(code) < self.terminal_width:
+            start = cell - self.terminal_width - 1
+            self.airport_mask[start:start + len(code)] = b'\x01' * len(code)
+            return True
+        return False
     
     def render_airport(self, lat: float, lon: float, code: str):
         """Render airport marker at given coordinates"""
         x, y = self.lat_lon_to_grid(lat, lon)
-        
-        # Clear previous airport cells tracking
-        self.airport_cells.clear()
+        label_fits = self._reserve_airport_cells(x, y, code)
         
         if 0 <= x < self.terminal_width and 0 <= y < self.map_height:
             # Use a distinctive symbol for the airport
-            self.grid[y][x] = 'O'
-            self.color_grid[y][x] = 'white'
-            self.airport_cells.add((x, y))
+            cell = y * self.terminal_width + x
+            self.grid[cell] = ord('O')
+            self.color_grid[cell] = self._airport_color_id
             
-            # Try to render the airport code around it if space permits
-            code = code[:3]  # Limit to 3 chars
-            # Place code above the airport marker if possible
-            if y > 0 and x - 1 >= 0 and x + len(code) < self.terminal_width:
-                for i, char in enumerate(code):
-                    code_x = x - 1 + i
-                    code_y = y - 1
-                    self.grid[code_y][code_x] = char
-                    self.color_grid[code_y][code_x] = 'white'
-                    self.airport_cells.add((code_x, code_y))
-    
-    def render_aircraft(self, aircraft_list: List[Aircraft]):
+            # Render the airport code above it if space permits
+            if label_fits:
+                code = code[:3]
+                start = cell - self.terminal_width - 1
+                self.grid[start:start + len(code)] = code.encode('latin-1', 'replace')
+                self.color_grid[start:start + len(code)] = bytes([self._airport_color_id]) * len(code)
+    
+    def _position_columns(self, aircraft_list: List[Aircraft]) -> Tuple[List[Aircraft], List[float], List[float]]:
+        """Get the aircraft with a position, with their latitudes and longitudes as columns
+        
+        Built once per frame and shared by the map and the info panel.
+        """
+        positioned = [a for a in aircraft_list if a.latitude is not None and a.longitude is not None]
+        return positioned, [a.latitude for a in positioned], [a.longitude for a in positioned]
+    
+    def render_aircraft(self, aircraft_list: List[Aircraft], columns: Tuple = None):
         """Render all aircraft on the grid"""
         self.clear_grid()
         
-        # First pass: render trails
-        for aircraft in aircraft_list:
-            if aircraft.latitude is not None and aircraft.longitude is not None:
-                self.render_aircraft_trails(aircraft)
-        
-        # Second pass: render aircraft (so they appear on top of trails)
-        for aircraft in aircraft_list:
-            if aircraft.latitude is not None and aircraft.longitude is not None:
-                x, y = self.lat_lon_to_grid(aircraft.latitude, aircraft.longitude)
-                
-                # Skip cells reserved for airport
-                if (x, y) not in self.airport_cells and 0 <= x < self.terminal_width and 0 <= y < self.map_height:
-                    symbol = self.get_aircraft_symbol(aircraft)
-                    color = self.get_aircraft_color(aircraft)
-                    
-                    self.grid[y][x] = symbol
-                    self.color_grid[y][x] = color
+        positioned, latitudes, longitudes = columns or self._position_columns(aircraft_list)
+        altitude_color_ids, altitude_bin = self._altitude_color_ids, self._altitude_bin
+        color_ids = [altitude_color_ids[altitude_bin(a)] for a in positioned]
+        
+        # Aircraft symbol codes
+        use_headings = self._use_headings
+        codes = [HEADING_CODES[int((a.track % 360 + 22.5) // 45) & 7]
+                 if use_headings and a.track is not None else ord(self.get_aircraft_symbol(a))
+                 for a in positioned]
+        
+        # Trails and aircraft are painted in one pass, in priority order:
+        # trail points reversed so the first trail to reach a cell keeps it,
+        # then aircraft so they appear on top of trails
+        if self._show_trails:
+            point_lats, point_lons, point_colors = self._trail_points(positioned, color_ids)
+            point_lats.reverse()
+            point_lons.reverse()
+            point_colors.reverse()
+        else:
+            point_lats, point_lons, point_colors = [], [], []
+        point_codes = [TRAIL_CODE] * len(point_lats)
+        point_lats += latitudes
+        point_lons += longitudes
+        point_colors += color_ids
+        point_codes += codes
+        
+        xs, ys = self.project_batch(point_lats, point_lons)
+        width = self.terminal_width
+        grid, color_grid, airport_mask = self.grid, self.color_grid, self.airport_mask
+        for x, y, code, color_id in zip(xs, ys, point_codes, point_colors):
+            # Skip cells reserved for airport
+            cell = y * width + x
+            if not airport_mask[cell]:
+                grid[cell] = code
+                color_grid[cell] = color_id
+    
+    def _fill_background(self, cells: slice, char: bytes, color_id: int):
+        """Paint a character over the background cells of a grid slice
+        
+        The slice may be strided (e.g. a column); each run of background
+        cells is written with one slice assignment.
+        """
+        start, _, step = cells.indices(len(self.grid))
+        for run in self._bg_run_re.finditer(self.grid[cells]):
+            length = run.end() - run.start()
+            first = start + run.start() * step
+            run_cells = slice(first, first + length * step, step)
+            self.grid[run_cells] = char * length
+            self.color_grid[run_cells] = bytes([color_id]) * length
     
     def render_border(self):
         """Render border around the display area"""
-        border_color = DISPLAY_CONFIG['colors']['border']
+        width = self.terminal_width
+        bottom = (self.map_height - 1) * width
+        end = bottom + width
+        border_color = self._border_color_id
         
         # Top and bottom borders
-        for x in range(self.terminal_width):
-            if self.grid[0][x] == self.ascii_style['background']:
-                self.grid[0][x] = '-'
-                self.color_grid[0][x] = border_color
-            if self.grid[self.map_height - 1][x] == self.ascii_style['background']:
-                self.grid[self.map_height - 1][x] = '-'
-                self.color_grid[self.map_height - 1][x] = border_color
+        self._fill_background(slice(0, width), b'-', border_color)
+        self._fill_background(slice(bottom, end), b'-', border_color)
         
         # Left and right borders
-        for y in range(self.map_height):
-            if self.grid[y][0] == self.ascii_style['background']:
-                self.grid[y][0] = '|'
-                self.color_grid[y][0] = border_color
-            if self.grid[y][self.terminal_width - 1] == self.ascii_style['background']:
-                self.grid[y][self.terminal_width - 1] = '|'
-                self.color_grid[y][self.terminal_width - 1] = border_color
+        self._fill_background(slice(0, end, width), b'|', border_color)
+        self._fill_background(slice(width - 1, end, width), b'|', border_color)
         
         # Corners
-        self.grid[0][0] = '+'
-        self.grid[0][self.terminal_width - 1] = '+'
-        self.grid[self.map_height - 1][0] = '+'
-        self.grid[self.map_height - 1][self.terminal_width - 1] = '+'
-        self.color_grid[0][0] = border_color
-        self.color_grid[0][self.terminal_width - 1] = border_color
-        self.color_grid[self.map_height - 1][0] = border_color
-        self.color_grid[self.map_height - 1][self.terminal_width - 1] = border_color
+        for cell in (0, width - 1, bottom, end - 1):
+            self.grid[cell] = ord('+')
+            self.color_grid[cell] = border_color
     
     def get_color_code(self, color_name: str) -> str:
         """Convert color name to ANSI color code"""
-        color_map = {
-            'black': Fore.BLACK,
-            'red': Fore.RED,
-            'green': Fore.GREEN,
-            'yellow': Fore.YELLOW,
-            'blue': Fore.BLUE,
-            'magenta': Fore.MAGENTA,
-            'cyan': Fore.CYAN,
-            'white': Fore.WHITE,
-        }
-        return color_map.get(color_name, '')
+        return COLOR_CODES[COLOR_IDS.get(color_name, 0)]
     
     def render_to_string(self, aircraft_list: List[Aircraft], 
                         show_info: bool = True, airport_info: Dict = None) -> str:
         """Render the complete display as a string"""
+        return '\n'.join(self.render_lines(aircraft_list, show_info, airport_info))
+    
+    def render_lines(self, aircraft_list: List[Aircraft], 
+                     show_info: bool = True, airport_info: Dict = None) -> List[str]:
+        """Render the complete display as a list of lines, without newlines"""
         # First, calculate airport cells if airport info provided
         if airport_info and 'lat' in airport_info and 'lon' in airport_info:
             code = airport_info.get('code', 'APT')
             # Pre-calculate airport cells before rendering aircraft
             x, y = self.lat_lon_to_grid(airport_info['lat'], airport_info['lon'])
-            self.airport_cells.clear()
-            if 0 <= x < self.terminal_width and 0 <= y < self.map_height:
-                self.airport_cells.add((x, y))
-                # Also reserve cells for the airport code
-                if y > 0 and x - 1 >= 0 and x + len(code[:3]) < self.terminal_width:
-                    for i in range(len(code[:3])):
-                        self.airport_cells.add((x - 1 + i, y - 1))
+            self._reserve_airport_cells(x, y, code)
         
         # Now render aircraft (which will avoid airport cells)
-        self.render_aircraft(aircraft_list)
+        columns = self._position_columns(aircraft_list)
+        self.render_aircraft(aircraft_list, columns)
         
         # Finally render airport on top
         if airport_info and 'lat' in airport_info and 'lon' in airport_info:
@@ -289,33 +449,35 @@ class ASCIIRenderer:
         
         self.render_border()
         
+        # Render grid with colors, decoding it once and joining each row's
+        # pieces once
+        width = self.terminal_width
+        chars = self.grid.decode('latin-1')
         output_lines = []
-        
-        # Render grid with colors
-        for y in range(self.map_height):
-            line = ""
-            
-            for x in range(self.terminal_width):
-                char = self.grid[y][x]
-                color = self.color_grid[y][x]
-                
-                # Add color if specified, then character, then reset
-                if color is not None:
-                    line += self.get_color_code(color) + char + Style.RESET_ALL
-                else:
-                    line += char
+        for start in range(0, width * self.map_height, width):
+            parts = []
+            append = parts.append
             
-            output_lines.append(line)
+            # Emit one transition escape per boundary between color runs
+            prev = 0
+            for run in COLOR_RUN_RE.finditer(self.color_grid, start, start + width):
+                color = run.group(1)[0]
+                append(COLOR_TRANSITIONS[prev][color])
+                append(chars[run.start():run.end()])
+                prev = color
+            append(COLOR_TRANSITIONS[prev][0])
+            output_lines.append(''.join(parts))
         
         # Add information panel if requested
         if show_info:
             # Clear from cursor to end of screen to prevent old text from persisting
             output_lines.append("\x1b[J") 
-            output_lines.extend(self._create_info_panel(aircraft_list, airport_info))
+            output_lines.extend(self._create_info_panel(aircraft_list, airport_info, columns))
         
-        return '\n'.join(output_lines)
+        return output_lines
     
-    def _create_info_panel(self, aircraft_list: List[Aircraft], airport_info: Dict = None) -> List[str]:
+    def _create_info_panel(self, aircraft_list: List[Aircraft], airport_info: Dict = None,
+                           columns: Tuple = None) -> List[str]:
         """Create information panel showing aircraft details"""
         info_lines = []
         info_lines.append("=" * self.terminal_width)
@@ -325,20 +487,20 @@ class ASCIIRenderer:
         if hasattr(self, 'session_display_mode'):
             display_mode = self.session_display_mode[0]
         else:
-            display_mode = DISPLAY_CONFIG.get('display_mode', 'all')
+            display_mode = self._display_mode
         
         # Get total aircraft count if available
         total_count = getattr(self, 'total_aircraft_count', len(aircraft_list))
         filtered_count = len(aircraft_list)
         
         # Combine time and mode info on one line
-        mode_str = "DEMO" if DISPLAY_CONFIG.get('demo_mode', False) else "LIVE"
-        airport = DISPLAY_CONFIG.get('airport', 'RDU')
-        info_lines.append(f"ADS-B Radar {datetime.utcnow().strftime('%H:%M:%S')}Z | {mode_str} | {airport} | Hotkeys: (r)efresh (t)oggle (q)uit")
+        mode_str = "DEMO" if self._demo_mode else "LIVE"
+        airport = self._airport_code
+        info_lines.append(f"ADS-B Radar {utc_clock()}Z | {mode_str} | {airport} | Hotkeys: (r)efresh (t)oggle (q)uit")
         
         # Show aircraft count with mode on one line
         if display_mode == 'closest':
-            limit = DISPLAY_CONFIG.get('display_aircraft_limit', 5)
+            limit = self._aircraft_limit
             info_lines.append(f"Aircraft: {total_count} total, showing closest {filtered_count}")
         elif display_mode == 'high':
             info_lines.append(f"Aircraft: {total_count} total, {filtered_count} high (>25k ft)")
@@ -357,17 +519,19 @@ class ASCIIRenderer:
         info_lines.append("ICAO     Call     Alt(ft)  Spd(kt)  Hdg°  Dist(nm)")
         info_lines.append("-" * 55)
         
-        # Sort by distance (closest first) to airport
+        # Get the limit for number of aircraft to display - reduced to 5
+        display_limit = min(5, self._aircraft_limit)
+        
+        # Sort by distance (closest first) to airport, only the rows shown
         if airport_info and 'lat' in airport_info and 'lon' in airport_info:
-            airport_lat = airport_info['lat']
-            airport_lon = airport_info['lon']
-            sorted_aircraft = sorted([a for a in aircraft_list if a.latitude is not None and a.longitude is not None], 
-                                     key=lambda x: calculate_distance(airport_lat, airport_lon, x.latitude, x.longitude))
+            positioned, latitudes, longitudes = columns or self._position_columns(aircraft_list)
+            distances = calculate_distances(airport_info['lat'], airport_info['lon'], latitudes, longitudes)
+            order = heapq.nsmallest(display_limit, range(len(positioned)), key=distances.__getitem__)
+            sorted_aircraft = [positioned[i] for i in order]
+            sorted_distances = [distances[i] for i in order]
         else:
             sorted_aircraft = aircraft_list # Fallback in case airport info is missing
-        
-        # Get the limit for number of aircraft to display - reduced to 5
-        display_limit = min(5, DISPLAY_CONFIG.get('display_aircraft_limit', 5))
+            sorted_distances = None
         
         for i, aircraft in enumerate(sorted_aircraft[:display_limit]):  # Apply display limit
             callsign = aircraft.callsign[:8] if aircraft.callsign else "N/A"
@@ -377,15 +541,14 @@ class ASCIIRenderer:
             # Color-code the altitude based on aircraft altitude category
             if aircraft.altitude:
                 altitude_str = f"{aircraft.altitude:,}"
-                altitude_color = self.get_aircraft_color(aircraft)
-                colored_altitude = f"{self.get_color_code(altitude_color)}{altitude_str:>8}{Style.RESET_ALL}"
+                altitude_code = COLOR_CODES[self._altitude_color_ids[self._altitude_bin(aircraft)]]
+                colored_altitude = f"{altitude_code}{altitude_str:>8}{Style.RESET_ALL}"
             else:
                 colored_altitude = "     N/A"
             
-            # Calculate distance if airport info is available
-            if airport_info and 'lat' in airport_info and 'lon' in airport_info:
-                distance = calculate_distance(airport_lat, airport_lon, aircraft.latitude, aircraft.longitude)
-                distance_str = f"{distance:.1f}"
+            # Distance was computed once for the sort above
+            if sorted_distances is not None:
+                distance_str = f"{sorted_distances[i]:.1f}"
             else:
                 distance_str = "N/A"
             
@@ -395,14 +558,27 @@ class ASCIIRenderer:
     
     def clear_screen(self):
         """Clear the terminal screen"""
-        os.system('clear' if os.name == 'posix' else 'cls')
+        if os.name == 'posix' or COLORAMA_AVAILABLE:
+            # Cursor home and erase display, no need to spawn a shell
+            # (colorama translates the sequence on Windows consoles)
+            sys.stdout.write(CLEAR_SCREEN)
+            sys.stdout.flush()
+        else:
+            os.system('cls')
     
     def display(self, aircraft_list: List[Aircraft], clear_screen: bool = True):
         """Display the rendered output to terminal"""
+        frame = self.render_to_string(aircraft_list) + '\n'
         if clear_screen:
-            self.clear_screen()
+            if os.name == 'posix' or COLORAMA_AVAILABLE:
+                # Send the clear sequence with the frame so the whole
+                # screen goes out in one write
+                frame = CLEAR_SCREEN + frame
+            else:
+                self.clear_screen()
         
-        print(self.render_to_string(aircraft_list))
+        sys.stdout.write(frame)
+        sys.stdout.flush()
 
 
 def create_demo_aircraft() -> List[Aircraft]:
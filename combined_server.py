@@ -4,40 +4,15 @@ This allows clients to connect via either protocol.
 """
 
 import asyncio
-import sys
-import threading
-from terminal_handler import config
+from terminal_handler import config, start_keyboard_monitor
 from telnet_server import main as telnet_main
 from ssh_server import main as ssh_main
 
-
-def keyboard_monitor(shutdown_event):
-    """Monitor keyboard input for shutdown command"""
-    print("\nPress 'x' or 's' in this console to shutdown all servers...\n")
-    
-    try:
-        import msvcrt  # Windows
-        while True:
-            if msvcrt.kbhit():
-                key = msvcrt.getch().decode('utf-8', errors='ignore').lower()
-                if key in ['x', 's']:
-                    print("\nShutdown command received from console.")
-                    shutdown_event.set()
-                    break
-    except ImportError:
-        # Unix/Linux
-        import termios, tty
-        old_settings = termios.tcgetattr(sys.stdin)
-        try:
-            tty.setraw(sys.stdin.fileno())
-            while True:
-                key = sys.stdin.read(1).lower()
-                if key in ['x', 's']:
-                    print("\nShutdown command received from console.")
-                    shutdown_event.set()
-                    break
-        finally:
-            termios.tcsetattr(sys.stdin, termios.TCSADRAIN, old_settings)
+# Optional libuv-based event loop for faster socket I/O
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
 
 
 async def run_combined_servers():
@@ -59,15 +34,15 @@ async def run_combined_servers():
     print("=" * 60)
     
     # Create tasks for both servers
-    telnet_task = asyncio.create_task(telnet_main(port=telnet_port, speed=speed))
-    ssh_task = asyncio.create_task(ssh_main(port=ssh_port, speed=speed))
-    
-    # Create shutdown event
-    shutdown_event = threading.Event()
+    # (this script owns the console, so the servers don't watch it themselves)
+    telnet_task = asyncio.create_task(telnet_main(port=telnet_port, speed=speed, monitor_console=False))
+    ssh_task = asyncio.create_task(ssh_main(port=ssh_port, speed=speed, monitor_console=False))
     
-    # Start keyboard monitor in separate thread
-    keyboard_thread = threading.Thread(target=keyboard_monitor, args=(shutdown_event,), daemon=True)
-    keyboard_thread.start()
+    # Create shutdown event and start watching the console for the shutdown key
+    shutdown_event = asyncio.Event()
+    print("\nPress 'x' or 's' in this console to shutdown all servers...\n")
+    stop_keyboard_monitor = start_keyboard_monitor(asyncio.get_running_loop(), shutdown_event)
+    shutdown_task = asyncio.create_task(shutdown_event.wait())
     
     print("\nServers are starting...")
     print(f"\nConnect via Telnet: telnet localhost {telnet_port}")
@@ -77,26 +52,24 @@ async def run_combined_servers():
     
     try:
         # Wait for either server to complete or shutdown event
-        while not shutdown_event.is_set():
-            # Check if any server task has completed (error condition)
-            done, pending = await asyncio.wait(
-                {telnet_task, ssh_task},
-                timeout=1.0,
-                return_when=asyncio.FIRST_COMPLETED
-            )
-            
-            if done:
-                # One of the servers crashed
-                for task in done:
-                    try:
-                        await task
-                    except Exception as e:
-                        print(f"\nServer error: {e}")
-                break
+        done, pending = await asyncio.wait(
+            {telnet_task, ssh_task, shutdown_task},
+            return_when=asyncio.FIRST_COMPLETED
+        )
+        
+        # A server task completing means one of the servers crashed
+        for task in done - {shutdown_task}:
+            try:
+                await task
+            except Exception as e:
+                print(f"\nServer error: {e}")
                 
     except KeyboardInterrupt:
         print("\nKeyboard interrupt received")
     finally:
+        stop_keyboard_monitor()
+        shutdown_task.cancel()
+        
         print("\nShutting down all servers...")
         
         # Cancel all server tasks
@@ -115,6 +88,9 @@ async def main():
 
 
 if __name__ == '__main__':
+    if uvloop is not None:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    
     try:
         asyncio.run(main())
     except KeyboardInterrupt:
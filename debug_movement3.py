@@ -23,7 +23,7 @@ for step in range(5):
         print(f"{a.icao}: lat={a.latitude:.4f}, lon={a.longitude:.4f}")
         print(f"  History: {len(a.position_history)} points")
         if len(a.position_history) >= 2:
-            last_two = a.position_history[-2:]
+            last_two = list(a.position_history)[-2:]
             print(f"  Last positions: {last_two}")
 
 print("\n=== TESTING RENDERER ===")
@@ -3,10 +3,13 @@
 Demo script specifically designed to show aircraft trails clearly
 """
 
+import math
 import time
 import signal
 import sys
+from collections import deque
 from datetime import datetime
+from functools import lru_cache
 
 from config import DISPLAY_CONFIG
 from adsb_data import Aircraft
@@ -26,47 +29,52 @@ def create_trail_demo_aircraft():
     for data in aircraft_data:
         aircraft = Aircraft(data["icao"])
         aircraft.update(data)
+        # The demo keeps longer trails than the configured trail_length
+        aircraft.position_history = deque(aircraft.position_history, maxlen=20)
         demo_aircraft.append(aircraft)
     
     return demo_aircraft
 
+@lru_cache(maxsize=360)
+def _heading_vector(track):
+    """Cosine and sine of a track in degrees, cached as tracks only change on a bounce"""
+    track_rad = track * 3.14159 / 180
+    return math.cos(track_rad), math.sin(track_rad)
+
 def animate_aircraft_aggressively(aircraft_list):
     """Animate aircraft with more visible movement to create clear trails"""
-    import random
+    # Read the bounds once per step rather than once per aircraft
+    bounds = DISPLAY_CONFIG['map_bounds']
+    lat_min, lat_max = bounds['lat_min'], bounds['lat_max']
+    lon_min, lon_max = bounds['lon_min'], bounds['lon_max']
     
     for aircraft in aircraft_list:
         if aircraft.latitude and aircraft.longitude and aircraft.track is not None:
             # More aggressive movement for better trail visibility
             speed_factor = 0.008  # Much faster movement
-            track_rad = aircraft.track * 3.14159 / 180
+            cos_track, sin_track = _heading_vector(aircraft.track)
             
             # Move aircraft in their heading direction
-            import math
-            lat_delta = speed_factor * math.cos(track_rad)
-            lon_delta = speed_factor * math.sin(track_rad)
+            lat_delta = speed_factor * cos_track
+            lon_delta = speed_factor * sin_track
             
             aircraft.latitude += lat_delta
             aircraft.longitude += lon_delta
             
             # Keep within bounds
-            bounds = DISPLAY_CONFIG['map_bounds']
-            if aircraft.latitude <= bounds['lat_min'] or aircraft.latitude >= bounds['lat_max']:
+            if aircraft.latitude <= lat_min or aircraft.latitude >= lat_max:
                 aircraft.track = (aircraft.track + 180) % 360  # Reverse direction
-            if aircraft.longitude <= bounds['lon_min'] or aircraft.longitude >= bounds['lon_max']:
+            if aircraft.longitude <= lon_min or aircraft.longitude >= lon_max:
                 aircraft.track = (180 - aircraft.track) % 360  # Bounce off walls
             
             # Clamp to bounds
-            aircraft.latitude = max(bounds['lat_min'], min(bounds['lat_max'], aircraft.latitude))
-            aircraft.longitude = max(bounds['lon_min'], min(bounds['lon_max'], aircraft.longitude))
+            aircraft.latitude = max(lat_min, min(lat_max, aircraft.latitude))
+            aircraft.longitude = max(lon_min, min(lon_max, aircraft.longitude))
             
             # Add to position history for trails
             aircraft.position_history.append(
                 (aircraft.latitude, aircraft.longitude, aircraft.last_seen)
             )
-            
-            # Limit trail length
-            if len(aircraft.position_history) > 20:
-                aircraft.position_history = aircraft.position_history[-20:]
 
 def main():
     print("🛩️  ADS-B ASCII Radar - Trail Demo")
@@ -108,6 +116,7 @@ def main():
     iteration = 0
     try:
         while running:
+            frame_start = time.perf_counter()
             iteration += 1
             
             # Animate aircraft
@@ -122,7 +131,8 @@ def main():
             renderer.display(demo_aircraft)
             
             # Wait a bit
-            time.sleep(0.8)  # Faster updates for better trail visibility
+            # Faster updates for better trail visibility, minus this frame's work
+            time.sleep(max(0, 0.8 - (time.perf_counter() - frame_start)))
             
     except KeyboardInterrupt:
         pass
@@ -6,10 +6,13 @@ Main application for displaying aircraft as ASCII art in the terminal
 
 import sys
 import time
+import random
+import asyncio
+import aiohttp
 import argparse
 import signal
 import logging
-from typing import Optional
+from typing import NamedTuple, Optional
 
 from config import ADSB_CONFIG, DISPLAY_CONFIG, ASCII_STYLES
 from adsb_data import ADSBDataFetcher
@@ -23,6 +26,20 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+class Bounds(NamedTuple):
+    """Geographic display bounds, in get_aircraft_in_bounds argument order"""
+    lat_min: float
+    lat_max: float
+    lon_min: float
+    lon_max: float
+    
+    @classmethod
+    def from_config(cls, map_bounds) -> 'Bounds':
+        """Build from a map_bounds dict as stored in DISPLAY_CONFIG"""
+        return cls(map_bounds['lat_min'], map_bounds['lat_max'],
+                   map_bounds['lon_min'], map_bounds['lon_max'])
+
+
 class ADSBRadarApp:
     """Main application class for ADS-B ASCII radar"""
     
@@ -31,6 +48,8 @@ class ADSBRadarApp:
         self.running = False
         self.data_fetcher = None if demo_mode else ADSBDataFetcher()
         self.renderer = ASCIIRenderer(style=style)
+        # Snapshot of the display bounds, refreshed by set_bounds
+        self.bounds = Bounds.from_config(DISPLAY_CONFIG['map_bounds'])
         self.update_interval = ADSB_CONFIG['update_interval']
         
         self.speed_multiplier = 1  # Default speed multiplier
@@ -52,6 +71,7 @@ class ADSBRadarApp:
             'lon_max': lon_max,
         })
         self.renderer.map_bounds = DISPLAY_CONFIG['map_bounds']
+        self.bounds = Bounds(lat_min, lat_max, lon_min, lon_max)
         logger.info(f"Set bounds to: {lat_min},{lon_min} -> {lat_max},{lon_max}")
     
     def set_data_source(self, url: str):
@@ -66,6 +86,10 @@ class ADSBRadarApp:
     
     def run_demo(self):
         """Run in demo mode with fake aircraft"""
+        return asyncio.run(self.run_demo_async())
+    
+    async def run_demo_async(self):
+        """Demo mode loop, paced with asyncio so it can share a loop with servers"""
         print("ADS-B ASCII Radar - Demo Mode")
         print(f"Speed multiplier: {self.speed_multiplier}x")
         print("Press Ctrl+C to exit")
@@ -76,41 +100,47 @@ class ADSBRadarApp:
         try:
             self.running = True
             while self.running:
+                frame_start = time.perf_counter()
+                
                 # Simulate aircraft movement
                 self._animate_demo_aircraft(demo_aircraft)
                 
                 # Render and display
                 self.renderer.display(demo_aircraft)
                 
-                # Wait for next update
-                time.sleep(self.update_interval)
+                # Wait out the rest of the interval, minus this frame's work
+                await asyncio.sleep(max(0, self.update_interval - (time.perf_counter() - frame_start)))
                 
         except KeyboardInterrupt:
             pass
         finally:
             print("\nDemo mode ended.")
     
-    def _animate_demo_aircraft(self, aircraft_list):
-        """Animate demo aircraft positions"""
-        import random
+    def _animate_demo_aircraft(self, aircraft_list) -> bool:
+        """Animate demo aircraft positions, returning whether any aircraft moved"""
+        # Simple movement simulation, same scale for every aircraft this step
+        speed_factor = 0.01 * self.speed_multiplier
+        
+        # The app's own bounds, not DISPLAY_CONFIG's, which other sessions may replace
+        lat_min, lat_max, lon_min, lon_max = self.bounds
+        moved = False
         
         for aircraft in aircraft_list:
             if aircraft.latitude and aircraft.longitude and aircraft.track is not None:
-                # Simple movement simulation
-                speed_factor = 0.01 * self.speed_multiplier
+                old_position = (aircraft.latitude, aircraft.longitude)
                 track_rad = aircraft.track * 3.14159 / 180
                 
                 # Move aircraft slightly in their heading direction
-                lat_delta = speed_factor * (aircraft.ground_speed or 400) / 60 * 0.00144
-                lon_delta = speed_factor * (aircraft.ground_speed or 400) / 60 * 0.00144
+                delta = speed_factor * (aircraft.ground_speed or 400) / 60 * 0.00144
                 
-                aircraft.latitude += lat_delta * abs(1 - abs(track_rad - 1.57) / 1.57)
-                aircraft.longitude += lon_delta * (1 if track_rad < 1.57 or track_rad > 4.71 else -1)
+                aircraft.latitude += delta * abs(1 - abs(track_rad - 1.57) / 1.57)
+                aircraft.longitude += delta * (1 if track_rad < 1.57 or track_rad > 4.71 else -1)
                 
                 # Keep within bounds
-                bounds = DISPLAY_CONFIG['map_bounds']
-                aircraft.latitude = max(bounds['lat_min'], min(bounds['lat_max'], aircraft.latitude))
-                aircraft.longitude = max(bounds['lon_min'], min(bounds['lon_max'], aircraft.longitude))
+                aircraft.latitude = max(lat_min, min(lat_max, aircraft.latitude))
+                aircraft.longitude = max(lon_min, min(lon_max, aircraft.longitude))
+                if (aircraft.latitude, aircraft.longitude) != old_position:
+                    moved = True
                 
                 # Add to position history for trails
                 aircraft.position_history.append(
@@ -120,9 +150,15 @@ class ADSBRadarApp:
                 # Randomly adjust heading slightly
                 if random.random() < 0.1:
                     aircraft.track = (aircraft.track + random.randint(-10, 10)) % 360
+        
+        return moved
     
     def run_live(self):
         """Run with live ADS-B data"""
+        return asyncio.run(self.run_live_async())
+    
+    async def run_live_async(self):
+        """Live mode loop; fetches with aiohttp and paces with asyncio"""
         print("ADS-B ASCII Radar - Live Mode")
         print("Press Ctrl+C to exit")
         print("=" * 50)
@@ -131,14 +167,19 @@ class ADSBRadarApp:
             print("Error: Data fetcher not initialized")
             return False
         
+        async with aiohttp.ClientSession() as session:
+            return await self._live_loop(session)
+    
+    async def _live_loop(self, session: aiohttp.ClientSession):
+        """Poll the data source and redraw until stopped"""
         # Test connection
         print("Testing ADS-B data connection...")
-        if not self.data_fetcher.update():
+        if not await self.data_fetcher.update_async(session):
             print("Warning: Could not connect to ADS-B data source")
             print(f"Trying to connect to: {ADSB_CONFIG['dump1090_url']}")
             print("Make sure dump1090 or another ADS-B source is running")
             
-            response = input("Continue anyway? (y/N): ")
+            response = await asyncio.to_thread(input, "Continue anyway? (y/N): ")
             if response.lower() != 'y':
                 return False
         else:
@@ -147,17 +188,15 @@ class ADSBRadarApp:
         try:
             self.running = True
             while self.running:
+                frame_start = time.perf_counter()
+                
                 # Update aircraft data
-                success = self.data_fetcher.update()
+                success = await self.data_fetcher.update_async(session)
                 if not success:
                     logger.warning("Failed to update aircraft data")
                 
                 # Get aircraft within bounds
-                bounds = DISPLAY_CONFIG['map_bounds']
-                aircraft_list = self.data_fetcher.get_aircraft_in_bounds(
-                    bounds['lat_min'], bounds['lat_max'],
-                    bounds['lon_min'], bounds['lon_max']
-                )
+                aircraft_list = self.data_fetcher.get_aircraft_in_bounds(*self.bounds)
                 
                 # Render and display
                 self.renderer.display(aircraft_list)
@@ -166,8 +205,8 @@ class ADSBRadarApp:
                 if not success:
                     print("WARNING: Data connection lost - retrying...")
                 
-                # Wait for next update
-                time.sleep(self.update_interval)
+                # Wait out the rest of the interval, minus this poll's work
+                await asyncio.sleep(max(0, self.update_interval - (time.perf_counter() - frame_start)))
                 
         except KeyboardInterrupt:
             pass
@@ -261,6 +300,7 @@ Examples:
     # Update DISPLAY_CONFIG to reflect current mode
     DISPLAY_CONFIG['demo_mode'] = args.demo
     DISPLAY_CONFIG['speed_multiplier'] = app.speed_multiplier
+    app.renderer.reload_config()
 
     # Run the application
     try:
@@ -6,9 +6,14 @@ Provides anonymous SSH access similar to telnet functionality.
 import asyncio
 import asyncssh
 import yaml
-import sys
-import threading
-from terminal_handler import handle_terminal_session, config
+import os
+from terminal_handler import handle_terminal_session, config, start_keyboard_monitor, get_session_limit
+
+# Optional libuv-based event loop for faster socket I/O
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
 
 # Global server reference for shutdown
 _server = None
@@ -18,6 +23,9 @@ _shutdown_event = None
 # Global speed configuration for SSH sessions
 _ssh_speed = 10
 
+# Where the server's host key is kept between runs
+DEFAULT_HOST_KEY_PATH = '~/.adsbterminal/ssh_host_key'
+
 class ADSBSSHServer(asyncssh.SSHServer):
     """Custom SSH server for anonymous access"""
     
@@ -71,12 +79,9 @@ async def handle_ssh_client(process):
             def __init__(self, writer, process):
                 self._writer = writer
                 self._process = process
-                
-            def write(self, data):
-                # SSH writer expects strings, not bytes
-                if isinstance(data, bytes):
-                    data = data.decode('utf-8')
-                self._writer.write(data)
+                # The session only writes text and the channel encodes it
+                # (encoding='utf-8'), so hand writes straight to asyncssh
+                self.write = writer.write
                 
             async def drain(self):
                 await self._writer.drain()
@@ -87,6 +92,9 @@ async def handle_ssh_client(process):
             def close(self):
                 self._writer.close()
                 
+            def get_extra_info(self, name, default=None):
+                return self._writer.get_extra_info(name, default)
+                
             def get_terminal_size(self):
                 """Get terminal size from SSH session"""
                 term_size = self._process.get_terminal_size()
@@ -96,8 +104,17 @@ async def handle_ssh_client(process):
         
         ssh_writer = SSHWriter(writer, process)
         
+        session_limit = get_session_limit()
+        if session_limit.locked():
+            # Turn clients over the limit away rather than leave them waiting
+            print(f"Session limit reached, turning away {peername}")
+            ssh_writer.write("Server is full, please try again later.\r\n")
+            await ssh_writer.drain()
+            return
+        
         # Handle the terminal session
-        await handle_terminal_session(reader, ssh_writer, speed, peername, protocol='ssh')
+        async with session_limit:
+            await handle_terminal_session(reader, ssh_writer, speed, peername, protocol='ssh')
         
     except Exception as e:
         print(f'Error handling SSH client: {e}')
@@ -107,43 +124,34 @@ async def handle_ssh_client(process):
         process.exit(0)
 
 
-def keyboard_monitor(loop, shutdown_event):
-    """Monitor keyboard input in server console"""
-    print("\nPress 'x' or 's' in this console to shutdown the SSH server...\n")
+def load_host_key(path=DEFAULT_HOST_KEY_PATH):
+    """Load the server's host key, generating and saving one on first start
+    
+    Reusing the key keeps the server's identity stable for clients and
+    avoids generating a key on every start.
+    """
+    path = os.path.expanduser(path)
+    if os.path.exists(path):
+        return asyncssh.read_private_key(path)
     
+    host_key = asyncssh.generate_private_key('ssh-ed25519')
     try:
-        import msvcrt  # Windows
-        while True:
-            if msvcrt.kbhit():
-                key = msvcrt.getch().decode('utf-8', errors='ignore').lower()
-                if key in ['x', 's']:
-                    print("\nShutdown command received from console.")
-                    # Create a coroutine to set the event
-                    async def set_shutdown():
-                        shutdown_event.set()
-                    asyncio.run_coroutine_threadsafe(set_shutdown(), loop)
-                    break
-    except ImportError:
-        # Unix/Linux - use different approach
-        import termios, tty
-        old_settings = termios.tcgetattr(sys.stdin)
-        try:
-            tty.setraw(sys.stdin.fileno())
-            while True:
-                key = sys.stdin.read(1).lower()
-                if key in ['x', 's']:
-                    print("\nShutdown command received from console.")
-                    # Create a coroutine to set the event
-                    async def set_shutdown():
-                        shutdown_event.set()
-                    asyncio.run_coroutine_threadsafe(set_shutdown(), loop)
-                    break
-        finally:
-            termios.tcsetattr(sys.stdin, termios.TCSADRAIN, old_settings)
-
-
-async def start_ssh_server(port=8024, speed=10):
-    """Start the SSH server"""
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        # Create the file owner-only before any key material is written
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        with os.fdopen(fd, 'wb') as key_file:
+            key_file.write(host_key.export_private_key())
+        print(f"Generated new SSH host key: {path}")
+    except OSError as e:
+        print(f"Could not save SSH host key to {path} ({e}), using a temporary key")
+    return host_key
+
+
+async def start_ssh_server(port=8024, speed=10, monitor_console=True):
+    """Start the SSH server
+    
+    With monitor_console, pressing 'x' or 's' in the server console shuts it down.
+    """
     global _server, _shutdown_event, _ssh_speed
     
     # Set global speed
@@ -156,16 +164,8 @@ async def start_ssh_server(port=8024, speed=10):
     # Create shutdown event
     _shutdown_event = asyncio.Event()
     
-    # Get current event loop
-    loop = asyncio.get_running_loop()
-    
-    # Start keyboard monitoring thread
-    keyboard_thread = threading.Thread(target=keyboard_monitor, args=(loop, _shutdown_event), daemon=True)
-    keyboard_thread.start()
-    
-    # Generate a temporary host key for this session
-    # In production, you'd want to save/load a persistent host key
-    host_key = asyncssh.generate_private_key('ssh-rsa')
+    # Load the persistent host key (created on first start)
+    host_key = load_host_key(config.get('ssh_host_key', DEFAULT_HOST_KEY_PATH))
     
     # Create SSH server factory
     def server_factory():
@@ -186,12 +186,20 @@ async def start_ssh_server(port=8024, speed=10):
     print(f"Connect using: ssh -p {port} guest@localhost")
     print("(Any username/password combination will work)")
     
+    # Watch the console for the shutdown key
+    if monitor_console:
+        print("\nPress 'x' or 's' in this console to shutdown the SSH server...\n")
+        stop_keyboard_monitor = start_keyboard_monitor(asyncio.get_running_loop(), _shutdown_event)
+    else:
+        stop_keyboard_monitor = lambda: None
+    
     try:
         # Wait for shutdown event
         await _shutdown_event.wait()
     except asyncio.CancelledError:
         pass
     finally:
+        stop_keyboard_monitor()
         print("\nShutting down SSH server...")
         _server.close()
         await _server.wait_closed()
@@ -199,9 +207,9 @@ async def start_ssh_server(port=8024, speed=10):
         print("SSH server shutdown complete.")
 
 
-async def main(port=8024, speed=10):
+async def main(port=8024, speed=10, monitor_console=True):
     """Main entry point for SSH server"""
-    await start_ssh_server(port, speed)
+    await start_ssh_server(port, speed, monitor_console)
 
 
 if __name__ == '__main__':
@@ -209,6 +217,9 @@ if __name__ == '__main__':
     ssh_port = config.get('ssh_port', 8024)
     speed = config.get('speed', 10)
     
+    if uvloop is not None:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    
     try:
         asyncio.run(main(port=ssh_port, speed=speed))
     except KeyboardInterrupt:
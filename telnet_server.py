@@ -1,9 +1,7 @@
 import asyncio
 import telnetlib3
 import yaml
-import sys
-import threading
-from terminal_handler import handle_terminal_session, config
+from terminal_handler import handle_terminal_session, config, start_keyboard_monitor, get_session_limit
 
 # Global server reference for shutdown
 _server = None
@@ -12,43 +10,18 @@ _shutdown_event = None  # Will be created in the async context
 async def shell(speed, reader, writer):
     """Telnet shell handler that uses the shared terminal session handler"""
     peername = writer.get_extra_info('peername')
-    await handle_terminal_session(reader, writer, speed, peername, protocol='telnet')
+    session_limit = get_session_limit()
+    if session_limit.locked():
+        # Turn clients over the limit away rather than leave them waiting
+        print(f"Session limit reached, turning away {peername}")
+        writer.write("Server is full, please try again later.\r\n")
+        await writer.drain()
+        writer.close()
+        return
+    async with session_limit:
+        await handle_terminal_session(reader, writer, speed, peername, protocol='telnet')
 
-def keyboard_monitor(loop, shutdown_event):
-    """Monitor keyboard input in server console"""
-    print("\nPress 'x' or 's' in this console to shutdown the server...\n")
-    
-    try:
-        import msvcrt  # Windows
-        while True:
-            if msvcrt.kbhit():
-                key = msvcrt.getch().decode('utf-8', errors='ignore').lower()
-                if key in ['x', 's']:
-                    print("\nShutdown command received from console.")
-                    # Create a coroutine to set the event
-                    async def set_shutdown():
-                        shutdown_event.set()
-                    asyncio.run_coroutine_threadsafe(set_shutdown(), loop)
-                    break
-    except ImportError:
-        # Unix/Linux - use different approach
-        import termios, tty
-        old_settings = termios.tcgetattr(sys.stdin)
-        try:
-            tty.setraw(sys.stdin.fileno())
-            while True:
-                key = sys.stdin.read(1).lower()
-                if key in ['x', 's']:
-                    print("\nShutdown command received from console.")
-                    # Create a coroutine to set the event
-                    async def set_shutdown():
-                        shutdown_event.set()
-                    asyncio.run_coroutine_threadsafe(set_shutdown(), loop)
-                    break
-        finally:
-            termios.tcsetattr(sys.stdin, termios.TCSADRAIN, old_settings)
-
-async def main(port=8023, speed=10):
+async def main(port=8023, speed=10, monitor_console=True):
     global _server, _shutdown_event
     print(f"Starting telnet server on port {port}...")
     print(f"Demo mode: {config.get('demomode', True)}, Speed: {config.get('speed', 10)}, Interval: {config.get('interval', 1)}")
@@ -56,13 +29,6 @@ async def main(port=8023, speed=10):
     # Create shutdown event in the async context
     _shutdown_event = asyncio.Event()
     
-    # Get current event loop
-    loop = asyncio.get_running_loop()
-    
-    # Start keyboard monitoring thread
-    keyboard_thread = threading.Thread(target=keyboard_monitor, args=(loop, _shutdown_event), daemon=True)
-    keyboard_thread.start()
-    
     # Create server with no timeout (timeout=None disables it)
     server = await telnetlib3.create_server(
         port=port, 
@@ -73,6 +39,13 @@ async def main(port=8023, speed=10):
     for sock in server.sockets:
         print(f"Listening on interface {sock.getsockname()[0]}:{sock.getsockname()[1]}")
     
+    # Watch the console for the shutdown key
+    if monitor_console:
+        print("\nPress 'x' or 's' in this console to shutdown the server...\n")
+        stop_keyboard_monitor = start_keyboard_monitor(asyncio.get_running_loop(), _shutdown_event)
+    else:
+        stop_keyboard_monitor = lambda: None
+    
     try:
         # Create tasks for both server and shutdown monitoring
         server_task = asyncio.create_task(server.serve_forever())
@@ -91,6 +64,7 @@ async def main(port=8023, speed=10):
     except asyncio.CancelledError:
         pass
     finally:
+        stop_keyboard_monitor()
         print("\nShutting down server...")
         server.close()
         await server.wait_closed()
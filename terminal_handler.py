@@ -5,12 +5,21 @@ by both telnet_server.py and ssh_server.py.
 """
 
 import asyncio
+import heapq
+import os
+import socket
+import sys
+import threading
 import yaml
 import re
 import time
+from collections import deque
 from datetime import datetime
+from functools import lru_cache
+from operator import itemgetter
 from ascii_renderer import ASCIIRenderer, create_demo_aircraft
 from main import ADSBRadarApp
+from adsb_data import calculate_distance, calculate_distances
 from adsb_api import fetch_aircraft_near_airport, ADSBApiClient, AIRPORTS, calculate_bounds_from_point
 from config import PROCESSING_CONFIG, DISPLAY_CONFIG
 
@@ -20,24 +29,54 @@ try:
 except ImportError:
     TerminalSizeChanged = None
 
+# telnetlib3's option code for window size negotiation (NAWS)
+try:
+    from telnetlib3.telopt import NAWS
+except ImportError:
+    NAWS = None
+
 # Load config file at module level
 with open('config.yaml', 'r') as file:
     config = yaml.safe_load(file)
 
+# ANSI color (SGR) sequences, and the same as a split pattern that keeps them
+ANSI_COLOR_RE = re.compile(r'\x1b\[[0-9;]*m')
+ANSI_COLOR_SPLIT_RE = re.compile(r'(\x1b\[[0-9;]*m)')
+
+# Cursor position report sent in reply to a \x1b[6n query
+CURSOR_POSITION_RE = re.compile(r'\x1b\[(\d+);(\d+)R')
+# Start of an escape sequence cut off at the end of a read
+PARTIAL_ESCAPE_RE = re.compile(r'\x1b(\[[0-9;]{0,10})?$')
+
+# Display modes in the order the 't' key cycles through them
+NEXT_DISPLAY_MODE = {'all': 'closest', 'closest': 'high', 'high': 'medium', 'medium': 'low', 'low': 'all'}
+
 def process_colored_line(line, terminal_width, use_colors):
     """Process a line with ANSI colors, ensuring proper terminal width"""
+    if terminal_width > 0 and '\x1b' not in line:
+        # Fast path for plain lines (most of the map): no regex work needed,
+        # and no color to reset when clipping
+        return line[:terminal_width].rstrip() + '\r\n'
+    
     if not use_colors:
-        clean_line = re.sub(r'\x1b\[[0-9;]*m', '', line)
+        clean_line = ANSI_COLOR_RE.sub('', line)
         if len(clean_line) > terminal_width:
             clean_line = clean_line[:terminal_width]
-        return clean_line.ljust(terminal_width).rstrip() + '\r\n'
+        # Padding to the width would only be stripped again
+        return clean_line.rstrip() + '\r\n'
     
-    segments = re.split(r'(\x1b\[[0-9;]*m)', line)
+    # The split alternates text and color sequences: odd entries are sequences
+    segments = ANSI_COLOR_SPLIT_RE.split(line)
+    if sum(map(len, segments[::2])) < terminal_width:
+        # Fits without truncation: the padding would only be stripped again
+        return line.rstrip() + '\r\n'
+
     visible_chars = 0
     result = ""
+    reset = ""
     
-    for segment in segments:
-        if re.match(r'\x1b\[[0-9;]*m', segment):
+    for index, segment in enumerate(segments):
+        if index & 1:
             result += segment
         else:
             remaining_width = terminal_width - visible_chars
@@ -46,7 +85,9 @@ def process_colored_line(line, terminal_width, use_colors):
             
             segment_len = len(segment)
             if segment_len > remaining_width:
+                # Reset so a truncated color run doesn't bleed past the line
                 result += segment[:remaining_width]
+                reset = '\x1b[0m'
                 visible_chars = terminal_width
                 break
             else:
@@ -56,93 +97,183 @@ def process_colored_line(line, terminal_width, use_colors):
     if visible_chars < terminal_width:
         result += ' ' * (terminal_width - visible_chars)
     
-    return result.rstrip() + '\r\n'
+    # Strip trailing blanks before the reset, as for lines that fit
+    return result.rstrip() + reset + '\r\n'
+
+# Most rows repeat from frame to frame (and between sessions), so reuse their output
+cached_colored_line = lru_cache(maxsize=1024)(process_colored_line)
+
+def changed_rows(output_lines, last_frame, terminal_height):
+    """Build the output that turns the last frame into this one.
+    
+    Both are lists of processed lines (see process_colored_line). Only rows
+    that differ are sent, each addressed directly and cleared before it is
+    rewritten; rows the last frame had beyond this one are erased.
+    last_frame is updated in place.
+    
+    A frame taller than the terminal can't be addressed row by row, as rows
+    past the bottom would all land on the last line, so it is redrawn in full
+    and left to scroll.
+    """
+    if len(output_lines) > terminal_height:
+        last_frame.clear()
+        return "\x1b[H" + ''.join(output_lines)
+    
+    parts = []
+    last_count = len(last_frame)
+    for row, output_line in enumerate(output_lines):
+        if row >= last_count or output_line != last_frame[row]:
+            parts.append(f"\x1b[{row + 1};1H\x1b[K{output_line[:-2]}")
+    if len(output_lines) < last_count:
+        parts.append(f"\x1b[{len(output_lines) + 1};1H\x1b[J")
+    last_frame[:] = output_lines
+    return ''.join(parts)
 
-async def reader_task(reader, queue):
-    """Reads data from the client and puts it into a queue."""
-    while True:
+async def handle_input(reader, app, refresh_requested, force_update, session_display_mode, cursor_report):
+    """Reads user input from the client and handles the key commands.
+    
+    A refresh ('r') is only flagged here for the session loop to run. While
+    it queries the terminal size, cursor_report[0] holds a future that this
+    task resolves with the terminal's reply.
+    """
+    debug = config.get('debug', False)
+    pending = ''  # Unfinished escape sequence left over from the last read
+    while app.running:
         try:
-            char = await reader.read(1)
-            if not char:
-                await queue.put(None)  # Signal EOF
-                break
-            # Handle both bytes and strings
-            if isinstance(char, bytes):
-                char = char.decode('utf-8', errors='ignore')
-            await queue.put(char)
+            # Take whatever has arrived (up to 64 chars) in one wakeup
+            chunk = await reader.read(64)
         except (ConnectionResetError, BrokenPipeError, asyncio.IncompleteReadError):
-            await queue.put(None)  # Signal EOF
-            break
+            chunk = None
         except Exception as e:
             # Check if this is a terminal size change exception from asyncssh
             # AsyncSSH raises TerminalSizeChanged when the terminal is resized
             if TerminalSizeChanged and isinstance(e, TerminalSizeChanged):
                 # This is expected during resize, just continue reading
-                if config.get('debug', False):
+                if debug:
                     print(f"Terminal resized during read (caught TerminalSizeChanged): {e}")
                 continue
             elif ("Terminal size change" in str(e) or 
                   "TerminalSizeChanged" in type(e).__name__ or
                   "window change" in str(e).lower()):
                 # Fallback string matching for cases where we couldn't import the exception
-                if config.get('debug', False):
+                if debug:
                     print(f"Terminal resized during read (string match): {e}")
                 continue
             else:
-                print(f"Reader task error: {e}")
-                await queue.put(None)  # Signal EOF
-                break
-
-async def handle_input(queue, app, on_reset, force_update, session_display_mode):
-    """Handles user input from the queue."""
-    debug = config.get('debug', False)
-    while app.running:
-        try:
-            char = await asyncio.wait_for(queue.get(), timeout=0.1)
-            if char is None:  # EOF
-                app.running = False
-                break
-
-            if debug:
-                print(f"Input received: {repr(char)} (len={len(char)})")
-
-            # Only process single printable ASCII characters
-            if len(char) == 1 and char.isprintable():
+                print(f"Input read error: {e}")
+                chunk = None
+        
+        if not chunk:  # EOF
+            app.running = False
+            force_update.set()
+            break
+        # Handle both bytes and strings
+        if isinstance(chunk, bytes):
+            chunk = chunk.decode('utf-8', errors='ignore')
+        if pending:
+            chunk = pending + chunk
+            pending = ''
+        if '\x1b' in chunk:
+            # Hand a cursor position report to a pending size query, and never
+            # dispatch one, as its 'R' would read as a key
+            match = CURSOR_POSITION_RE.search(chunk)
+            if match:
+                waiter = cursor_report[0]
+                if waiter is not None and not waiter.done():
+                    waiter.set_result(match.group(0))
+                chunk = CURSOR_POSITION_RE.sub('', chunk)
+            # A reply split across reads is matched once the rest arrives
+            partial = PARTIAL_ESCAPE_RE.search(chunk)
+            if partial:
+                pending = chunk[partial.start():]
+                chunk = chunk[:partial.start()]
+        
+        for char in chunk:
+            # Only process printable characters
+            if char.isprintable():
                 key = char.lower()
                 if key == 'q':
                     print("Quit command received.")
                     app.running = False
+                    force_update.set()
+                    break
                 elif key == 'r':
                     print("Refreshing display, re-detecting terminal size, and clearing trails...")
-                    await on_reset(clear_trails=True, refresh_display=True)
+                    refresh_requested[0] = True
+                    force_update.set()
                 elif key == 't':
                     # Toggle display mode for this session only
-                    modes = ['all', 'closest', 'high', 'medium', 'low']
-                    current_idx = modes.index(session_display_mode[0])
-                    next_idx = (current_idx + 1) % len(modes)
-                    session_display_mode[0] = modes[next_idx]
+                    session_display_mode[0] = NEXT_DISPLAY_MODE[session_display_mode[0]]
                     print(f"Display mode changed to: {session_display_mode[0].upper()} (session-specific)")
                     # Force screen update
                     force_update.set()
-        except asyncio.TimeoutError:
-            continue
 
-async def detect_terminal_size(reader, writer, is_ssh=False):
-    """Detect current terminal size using cursor position query."""
+def telnet_window_size(writer):
+    """Window size the telnet client reported via NAWS, or (None, None).
+    
+    telnetlib3 fills in a default size, so it is only used once the client
+    has agreed to send its own.
+    """
+    remote_option = getattr(writer, 'remote_option', None)
+    if NAWS is None or remote_option is None or not remote_option.enabled(NAWS):
+        return None, None
+    return writer.get_extra_info('cols'), writer.get_extra_info('rows')
+
+def enable_tcp_keepalive(sock, idle_seconds):
+    """Have the OS probe the connection once it has been idle for idle_seconds.
+    
+    Unlike writing keepalive data from the session, this keeps NAT entries
+    alive and drops peers that have gone away without any Python work.
+    """
+    if sock is None:
+        return
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+    # The idle time option is TCP_KEEPALIVE on macOS
+    idle_option = getattr(socket, 'TCP_KEEPIDLE', getattr(socket, 'TCP_KEEPALIVE', None))
+    if idle_option is not None:
+        sock.setsockopt(socket.IPPROTO_TCP, idle_option, idle_seconds)
+    if hasattr(socket, 'TCP_KEEPINTVL'):
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, idle_seconds)
+
+async def read_cursor_report(reader):
+    """Read client input until a whole cursor position report has arrived.
+    
+    The reply can come in over several reads, so keep reading rather than
+    parsing whatever the first read returned.
+    """
+    response = ''
+    while not CURSOR_POSITION_RE.search(response):
+        chunk = await reader.read(20)
+        if not chunk:
+            break
+        if isinstance(chunk, bytes):
+            chunk = chunk.decode('utf-8', errors='ignore')
+        response += chunk
+    return response
+
+async def detect_terminal_size(reader, writer, is_ssh=False, cursor_report=None):
+    """Detect current terminal size using cursor position query.
+    
+    If another task is reading the client's input, pass a future that it
+    resolves with the reply as cursor_report instead of reading here.
+    """
     try:
         # Save cursor, move to bottom-right corner, and query position
         writer.write('\x1b[s\x1b[999;999H\x1b[6n')
         await writer.drain()
         
         # Read the response
-        response = await asyncio.wait_for(reader.read(20), timeout=1.0)
+        if cursor_report is None:
+            response = await asyncio.wait_for(read_cursor_report(reader), timeout=1.0)
+        else:
+            response = await asyncio.wait_for(cursor_report, timeout=1.0)
         
         # Restore cursor position
         writer.write('\x1b[u')
         await writer.drain()
         
         # Parse the response
-        match = re.search(r'\x1b\[(\d+);(\d+)R', response)
+        match = CURSOR_POSITION_RE.search(response)
         if match:
             rows, cols = int(match.group(1)), int(match.group(2))
             if rows > 0 and cols > 0:
@@ -162,6 +293,80 @@ async def detect_terminal_size(reader, writer, is_ssh=False):
         
     return None, None
 
+def start_keyboard_monitor(loop, shutdown_event):
+    """Monitor keyboard input for shutdown command
+    
+    Sets the asyncio shutdown_event when 'x' or 's' is pressed. Returns a
+    function that stops monitoring and restores the console.
+    """
+    try:
+        import msvcrt  # Windows
+    except ImportError:
+        msvcrt = None
+    
+    if msvcrt is not None:
+        # The Windows console can't be watched by the event loop, so block
+        # on it in a thread and hand the key press over to the loop
+        def monitor():
+            while True:
+                # getwch blocks until a key is pressed, no need to poll kbhit
+                key = msvcrt.getwch().lower()
+                if key in ['x', 's']:
+                    print("\nShutdown command received from console.")
+                    loop.call_soon_threadsafe(shutdown_event.set)
+                    break
+        
+        threading.Thread(target=monitor, daemon=True).start()
+        return lambda: None
+    
+    # Unix/Linux: let the event loop tell us when a key is available
+    if not sys.stdin.isatty():
+        return lambda: None
+    
+    import termios, tty
+    fd = sys.stdin.fileno()
+    old_settings = termios.tcgetattr(fd)
+    tty.setcbreak(fd)
+    
+    def on_key():
+        try:
+            data = os.read(fd, 1)
+        except OSError:
+            data = b''
+        if not data:
+            # The console went away; it would otherwise stay readable forever
+            loop.remove_reader(fd)
+            return
+        key = data.decode('utf-8', errors='ignore').lower()
+        if key in ['x', 's']:
+            print("\nShutdown command received from console.")
+            shutdown_event.set()
+    
+    loop.add_reader(fd, on_key)
+    
+    def stop():
+        loop.remove_reader(fd)
+        try:
+            termios.tcsetattr(fd, termios.TCSADRAIN, old_settings)
+        except termios.error:
+            pass  # The console is already gone
+    
+    return stop
+
+_session_limit = None  # See get_session_limit
+
+def get_session_limit():
+    """Semaphore capping concurrent sessions at max_sessions.
+    
+    One is shared by every server in the process, so running telnet and SSH
+    together doesn't double the limit. It is created on first use so that it
+    belongs to the running event loop.
+    """
+    global _session_limit
+    if _session_limit is None:
+        _session_limit = asyncio.Semaphore(config.get('max_sessions', 64))
+    return _session_limit
+
 async def handle_terminal_session(reader, writer, speed, peername, protocol='telnet'):
     """
     Main terminal session handler that works for both telnet and SSH.
@@ -174,11 +379,15 @@ async def handle_terminal_session(reader, writer, speed, peername, protocol='tel
         protocol: 'telnet' or 'ssh'
     """
     print(f"Client connected via {protocol} from {peername}")
+    debug = config.get('debug', False)
     
-    input_queue = asyncio.Queue()
-    
-    # Give client time to establish connection
-    await asyncio.sleep(0.2)
+    # Keepalives are left to TCP (0 disables them)
+    keepalive_interval = config.get('keepalive_interval', 30)
+    if keepalive_interval > 0 and hasattr(writer, 'get_extra_info'):
+        try:
+            enable_tcp_keepalive(writer.get_extra_info('socket'), keepalive_interval)
+        except OSError as e:
+            print(f"Could not enable TCP keepalive for {peername}: {e}")
     
     # --- Terminal Size Detection ---
     terminal_width, terminal_height = None, None
@@ -191,21 +400,11 @@ async def handle_terminal_session(reader, writer, speed, peername, protocol='tel
         print(f"Attempting terminal size detection for {peername}...")
         
         if protocol == 'telnet':
-            # telnetlib3 handles NAWS negotiation automatically
-            # Give NAWS more time to negotiate
-            await writer.drain()
-            await asyncio.sleep(0.5)  # Increased delay for NAWS negotiation
-            
-            # Try multiple times to get the size
-            for attempt in range(3):
-                if hasattr(writer, 'get_extra_info'):
-                    terminal_width = writer.get_extra_info('columns')
-                    terminal_height = writer.get_extra_info('lines')
-                    if terminal_width and terminal_height:
-                        print(f"Detected size via NAWS (attempt {attempt+1}): {terminal_width}x{terminal_height}")
-                        break
-                if attempt < 2:
-                    await asyncio.sleep(0.2)  # Wait a bit more between attempts
+            # telnetlib3 only starts the shell once option negotiation is
+            # over, so NAWS has already arrived if the client supports it
+            terminal_width, terminal_height = telnet_window_size(writer)
+            if terminal_width and terminal_height:
+                print(f"Detected size via NAWS: {terminal_width}x{terminal_height}")
         elif protocol == 'ssh':
             # For SSH, try to get terminal size from the SSH session
             if hasattr(writer, 'get_terminal_size'):
@@ -225,9 +424,6 @@ async def handle_terminal_session(reader, writer, speed, peername, protocol='tel
         terminal_width, terminal_height = 120, 40
         print(f"All detection methods failed. Using modern default size: {terminal_width}x{terminal_height}")
         print("Tip: You can set custom terminal size in config.yaml")
-    
-    # Start the reader task AFTER terminal size detection
-    rtask = asyncio.create_task(reader_task(reader, input_queue))
 
     # --- App Setup ---
     print(f"Final terminal size: width={terminal_width}, height={terminal_height}")
@@ -246,21 +442,24 @@ async def handle_terminal_session(reader, writer, speed, peername, protocol='tel
     
     # Variables to track resize state for telnet
     telnet_resize_pending = [False]  # Use list to allow modification in nested function
+    refresh_requested = [False]  # Set by the 'r' key, handled by the main loop
+    cursor_report = [None]  # Future for the reply to a size query, see handle_input
+    last_frame = []  # Rows on the client's screen; cleared to force a full redraw
+    filter_cache = {'key': None, 'aircraft': None}  # Display mode filter result
     
     # Function to check for terminal resize
     def check_terminal_resize():
-        nonlocal terminal_width, terminal_height, renderer
+        nonlocal terminal_width, terminal_height
         new_width = new_height = None
         
-        if protocol == 'telnet' and hasattr(writer, 'get_extra_info'):
-            new_width = writer.get_extra_info('columns')
-            new_height = writer.get_extra_info('lines')
+        if protocol == 'telnet':
+            new_width, new_height = telnet_window_size(writer)
         elif protocol == 'ssh' and hasattr(writer, 'get_terminal_size'):
             try:
                 new_width, new_height = writer.get_terminal_size()
             except Exception as e:
                 # SSH resize might fail if terminal is resizing
-                if config.get('debug', False):
+                if debug:
                     print(f"SSH resize detection error: {e}")
                 pass
         
@@ -275,9 +474,9 @@ async def handle_terminal_session(reader, writer, speed, peername, protocol='tel
                 'terminal_height': terminal_height
             })
             
-            # Recreate renderer with new dimensions
-            renderer = ASCIIRenderer()
-            renderer.session_display_mode = session_display_mode
+            # Resize the renderer in place and redraw everything
+            renderer.resize(terminal_width, terminal_height)
+            last_frame.clear()
             
             # For telnet, mark that we need to do a full refresh
             if protocol == 'telnet':
@@ -309,52 +508,52 @@ async def handle_terminal_session(reader, writer, speed, peername, protocol='tel
         """Fetches live aircraft or creates demo data based on mode"""
         if app.demo_mode:
             return create_demo_aircraft()
-        if config.get('debug', False):
+        if debug:
             print(f"Fetching live data for {airport_code}, radius {radius}")
         return await fetch_aircraft_near_airport(airport_code, radius)
 
     # Setup reset function for async context
-    aircraft_ref = {'data': None}
+    aircraft_ref = {'data': None, 'version': 0}  # version changes with the data
     tracked_aircraft = {}  # Keep track of aircraft across updates
+    max_history = config.get('trail_length', PROCESSING_CONFIG.get('trail_length', 15))
     force_update = asyncio.Event()  # Event to trigger immediate screen update
     
     async def reset_aircraft(clear_trails=False, refresh_display=False):
         """Reset aircraft data - works for both demo and live modes"""
-        nonlocal terminal_width, terminal_height, renderer, rtask
+        nonlocal terminal_width, terminal_height
         
         # If refresh_display is requested, re-detect terminal size
         if refresh_display:
-            if config.get('debug', False):
+            if debug:
                 print("Re-detecting terminal size...")
             
-            # Pause the reader task temporarily
-            rtask.cancel()
-            await asyncio.sleep(0.1)
-            
-            # Try to detect new size
-            detected_width, detected_height = await detect_terminal_size(reader, writer, is_ssh=(protocol=='ssh'))
+            # Try to detect new size; the input handler keeps reading and
+            # passes the reply on through cursor_report
+            cursor_report[0] = asyncio.get_running_loop().create_future()
+            try:
+                detected_width, detected_height = await detect_terminal_size(
+                    reader, writer, is_ssh=(protocol=='ssh'), cursor_report=cursor_report[0])
+            finally:
+                cursor_report[0] = None
             if detected_width and detected_height:
                 terminal_width = detected_width
                 terminal_height = detected_height
-                if config.get('debug', False):
+                if debug:
                     print(f"Detected size via cursor query: {terminal_width}x{terminal_height}")
             
-            # Restart the reader task
-            rtask = asyncio.create_task(reader_task(reader, input_queue))
-            
             # Update display config
             DISPLAY_CONFIG.update({
                 'terminal_width': terminal_width,
                 'terminal_height': terminal_height
             })
             
-            # Recreate renderer with new dimensions
-            renderer = ASCIIRenderer()
-            renderer.session_display_mode = session_display_mode
+            # Resize the renderer in place
+            renderer.resize(terminal_width, terminal_height)
             
             # Clear screen and reset cursor
             writer.write("\x1b[2J\x1b[1;1H\x1b[?25l")
             await writer.drain()
+            last_frame.clear()
             
             clear_trails = True
             force_update.set()
@@ -363,11 +562,12 @@ async def handle_terminal_session(reader, writer, speed, peername, protocol='tel
         if clear_trails:
             if tracked_aircraft:
                 for aircraft in tracked_aircraft.values():
-                    aircraft.position_history = []
-                if config.get('debug', False):
+                    aircraft.position_history.clear()
+                if debug:
                     print("Cleared all aircraft trails")
                 if not refresh_display and not app.demo_mode:
                     aircraft_ref['data'] = list(tracked_aircraft.values())
+                    aircraft_ref['version'] += 1
                     force_update.set()
                     return
         
@@ -375,22 +575,32 @@ async def handle_terminal_session(reader, writer, speed, peername, protocol='tel
         new_data = await fetch_aircraft()
         
         if app.demo_mode:
+            # Demo aircraft come with the default trail buffer; size it to
+            # this session's trail_length, as for live aircraft
+            for aircraft in new_data:
+                if aircraft.position_history.maxlen != max_history:
+                    aircraft.position_history = deque(aircraft.position_history, maxlen=max_history)
             aircraft_ref['data'] = new_data
         else:
             # For live mode, maintain position history
-            current_icaos = set()
             updated_aircraft = []
+            # One timestamp for the new trail points, as they all arrived together
+            seen_at = datetime.now()
             
             for new_aircraft in new_data:
                 icao = new_aircraft.icao
-                current_icaos.add(icao)
                 
-                if icao in tracked_aircraft:
-                    existing = tracked_aircraft[icao]
+                existing = tracked_aircraft.get(icao)
+                if existing is not None:
                     if not clear_trails:
-                        new_aircraft.position_history = existing.position_history.copy()
+                        # Carry the trail buffer over instead of copying it;
+                        # only rebuild it when its size doesn't match
+                        history = existing.position_history
+                        if history.maxlen != max_history:
+                            history = deque(history, maxlen=max_history)
+                        new_aircraft.position_history = history
                     else:
-                        new_aircraft.position_history = []
+                        new_aircraft.position_history.clear()
                     
                     # Check if position has changed enough to add to history
                     if new_aircraft.latitude and new_aircraft.longitude:
@@ -399,43 +609,44 @@ async def handle_terminal_session(reader, writer, speed, peername, protocol='tel
                             should_add = True
                         else:
                             last_lat, last_lon, _ = new_aircraft.position_history[-1]
-                            from adsb_data import calculate_distance
                             dist = calculate_distance(last_lat, last_lon, new_aircraft.latitude, new_aircraft.longitude)
                             if dist > 0.5:  # 0.5 nautical miles minimum between points
                                 should_add = True
                                 
                         if should_add:
-                            new_aircraft.position_history.append((new_aircraft.latitude, new_aircraft.longitude, datetime.now()))
-                            max_history = config.get('trail_length', PROCESSING_CONFIG.get('trail_length', 15))
-                            if len(new_aircraft.position_history) > max_history:
-                                new_aircraft.position_history = new_aircraft.position_history[-max_history:]
+                            new_aircraft.position_history.append((new_aircraft.latitude, new_aircraft.longitude, seen_at))
                 else:
                     # New aircraft
                     if new_aircraft.latitude and new_aircraft.longitude and not clear_trails:
-                        new_aircraft.position_history.append((new_aircraft.latitude, new_aircraft.longitude, datetime.now()))
+                        new_aircraft.position_history.append((new_aircraft.latitude, new_aircraft.longitude, seen_at))
                 
                 tracked_aircraft[icao] = new_aircraft
                 updated_aircraft.append(new_aircraft)
             
             # Remove aircraft that are no longer being tracked
-            for icao in list(tracked_aircraft.keys()):
-                if icao not in current_icaos:
-                    del tracked_aircraft[icao]
+            for icao in tracked_aircraft.keys() - {a.icao for a in new_data}:
+                del tracked_aircraft[icao]
             
             aircraft_ref['data'] = updated_aircraft
+        aircraft_ref['version'] += 1
         
-        if config.get('debug', False):
+        if debug:
             print(f"Loaded {len(aircraft_ref['data'])} aircraft")
 
-    # Clear any remaining data from terminal size detection
-    cleared_count = 0
-    while not input_queue.empty():
-        try:
-            char = input_queue.get_nowait()
-            cleared_count += 1
-        except asyncio.QueueEmpty:
-            break
-    
+    async def live_fetch_loop():
+        """Refresh live data every update interval, independently of drawing"""
+        # The first data set is loaded during setup, so start with a wait
+        delay = app.update_interval
+        while app.running:
+            await asyncio.sleep(delay)
+            fetch_start = time.perf_counter()
+            try:
+                await reset_aircraft()
+                force_update.set()
+            except Exception as e:
+                print(f"Error refreshing aircraft for {peername}: {e}")
+            delay = max(0, app.update_interval - (time.perf_counter() - fetch_start))
+
     # Set app.running to True BEFORE starting the input handler
     app.running = True
     
@@ -443,49 +654,40 @@ async def handle_terminal_session(reader, writer, speed, peername, protocol='tel
     await reset_aircraft(clear_trails=True)
 
     # Start input handler
-    input_task = asyncio.create_task(handle_input(input_queue, app, reset_aircraft, force_update, session_display_mode))
+    input_task = asyncio.create_task(handle_input(reader, app, refresh_requested, force_update, session_display_mode, cursor_report))
 
     # --- Main Loop ---
     writer.write("\x1b[2J\x1b[1;1H\x1b[?25l")
     await writer.drain()
     
-    # Give the terminal a moment to stabilize
-    await asyncio.sleep(0.5)
-    
     # For telnet, force a display refresh after initial connection
     # This fixes display issues with initial terminal size detection
     if protocol == 'telnet':
         print("Performing initial telnet display refresh...")
         # Trigger a full refresh cycle
         await reset_aircraft(clear_trails=True, refresh_display=True)
-        # Give the refresh a moment to complete
-        await asyncio.sleep(0.2)
     
-    last_data_update = time.time()
-    last_keepalive = time.time()
-    update_counter = 0
-    keepalive_interval = config.get('keepalive_interval', 30)
+    # Live data is fetched by its own task, so a slow fetch never stalls drawing or input
+    fetch_task = None if app.demo_mode else asyncio.create_task(live_fetch_loop())
+    
+    # Settings that stay fixed for the session, read once instead of per frame
+    use_colors = config.get('use_colors', True)
+    closest_limit = DISPLAY_CONFIG.get('display_aircraft_limit', 5)
+    if airport_info:
+        airport_lat = airport_info['lat']
+        airport_lon = airport_info['lon']
+        # Passed to the renderer every frame; its contents never change
+        airport_display_info = {'lat': airport_lat, 'lon': airport_lon, 'code': airport_code}
+    else:
+        airport_display_info = None
     
     try:
         while app.running:
+            frame_start = time.perf_counter()
             if writer.is_closing():
                 print(f"Client {peername} connection closed.")
                 break
             
-            # Send periodic keepalive to prevent timeout
-            current_time = time.time()
-            if keepalive_interval > 0 and current_time - last_keepalive > keepalive_interval:
-                try:
-                    # Send empty data as keepalive
-                    writer.write('')
-                    await writer.drain()
-                    last_keepalive = current_time
-                    if config.get('debug', False):
-                        print(f"Sent keepalive to {peername}")
-                except Exception as e:
-                    print(f"Keepalive failed for {peername}: {e}")
-                    break
-            
             # Check for terminal resize
             try:
                 if check_terminal_resize():
@@ -496,93 +698,86 @@ async def handle_terminal_session(reader, writer, speed, peername, protocol='tel
                         # Call the exact same refresh function that 'r' key uses
                         await reset_aircraft(clear_trails=True, refresh_display=True)
             except Exception as e:
-                if config.get('debug', False):
+                if debug:
                     print(f"Error during terminal resize check: {e}")
                 # Continue running even if resize detection fails
             
-            # In live mode, periodically refresh data
-            current_time = time.time()
-            if not app.demo_mode and (current_time - last_data_update) >= app.update_interval:
-                await reset_aircraft()
-                last_data_update = current_time
-            
-            try:
-                writer.write("\x1b[H")
-            except Exception as e:
-                if config.get('debug', False):
-                    print(f"Error writing cursor home: {e}")
-                # Connection might be broken, exit gracefully
-                break
+            # Refresh requested with the 'r' key
+            if refresh_requested[0]:
+                refresh_requested[0] = False
+                await reset_aircraft(clear_trails=True, refresh_display=True)
             
             # Animate or display current aircraft
             current_aircraft = aircraft_ref['data']
             if current_aircraft:
-                if app.demo_mode:
-                    app._animate_demo_aircraft(current_aircraft)
+                if app.demo_mode and app._animate_demo_aircraft(current_aircraft):
+                    aircraft_ref['version'] += 1
                 
-                # Filter aircraft based on session-specific display mode
+                # Filter aircraft based on session-specific display mode, reusing
+                # the last result until the data or the mode changes
                 mode = session_display_mode[0]
                 
-                if mode == 'closest' and airport_info:
-                    from adsb_data import calculate_distance
-                    airport_lat = airport_info['lat']
-                    airport_lon = airport_info['lon']
-                    limit = DISPLAY_CONFIG.get('display_aircraft_limit', 5)
-                    
-                    aircraft_with_pos = [a for a in current_aircraft if a.latitude is not None and a.longitude is not None]
-                    sorted_aircraft = sorted(aircraft_with_pos, 
-                                           key=lambda x: calculate_distance(airport_lat, airport_lon, x.latitude, x.longitude))
-                    filtered_aircraft = sorted_aircraft[:limit]
-                elif mode in ['high', 'medium', 'low']:
-                    filtered_aircraft = []
-                    for aircraft in current_aircraft:
-                        if aircraft.altitude is not None:
-                            if mode == 'high' and aircraft.altitude > 25000:
-                                filtered_aircraft.append(aircraft)
-                            elif mode == 'medium' and 10000 <= aircraft.altitude <= 25000:
-                                filtered_aircraft.append(aircraft)
-                            elif mode == 'low' and aircraft.altitude < 10000:
-                                filtered_aircraft.append(aircraft)
+                filter_key = (aircraft_ref['version'], mode)
+                if filter_cache['key'] == filter_key:
+                    filtered_aircraft = filter_cache['aircraft']
                 else:
-                    filtered_aircraft = current_aircraft
+                    if mode == 'closest' and airport_info:
+                        aircraft_with_pos = [a for a in current_aircraft if a.latitude is not None and a.longitude is not None]
+                        # One batched distance pass, then pick the closest without sorting everything
+                        distances = calculate_distances(airport_lat, airport_lon,
+                                                        [a.latitude for a in aircraft_with_pos],
+                                                        [a.longitude for a in aircraft_with_pos])
+                        if 0 <= closest_limit < len(aircraft_with_pos):
+                            closest = heapq.nsmallest(closest_limit, zip(distances, aircraft_with_pos), key=itemgetter(0))
+                        else:
+                            closest = sorted(zip(distances, aircraft_with_pos), key=itemgetter(0))[:closest_limit]
+                        filtered_aircraft = [a for _, a in closest]
+                    elif mode in ['high', 'medium', 'low']:
+                        filtered_aircraft = []
+                        for aircraft in current_aircraft:
+                            if aircraft.altitude is not None:
+                                if mode == 'high' and aircraft.altitude > 25000:
+                                    filtered_aircraft.append(aircraft)
+                                elif mode == 'medium' and 10000 <= aircraft.altitude <= 25000:
+                                    filtered_aircraft.append(aircraft)
+                                elif mode == 'low' and aircraft.altitude < 10000:
+                                    filtered_aircraft.append(aircraft)
+                    else:
+                        filtered_aircraft = current_aircraft
+                    filter_cache['key'] = filter_key
+                    filter_cache['aircraft'] = filtered_aircraft
                 
                 # Pass airport info to renderer
-                airport_display_info = {
-                    'lat': airport_info['lat'],
-                    'lon': airport_info['lon'],
-                    'code': airport_code
-                } if airport_info else None
                 renderer.total_aircraft_count = len(current_aircraft)
-                display_output = renderer.render_to_string(filtered_aircraft, show_info=True, airport_info=airport_display_info)
+                lines = renderer.render_lines(filtered_aircraft, show_info=True, airport_info=airport_display_info)
             else:
                 # No aircraft data
-                airport_display_info = {
-                    'lat': airport_info['lat'],
-                    'lon': airport_info['lon'],
-                    'code': airport_code
-                } if airport_info else None
                 renderer.total_aircraft_count = 0
-                display_output = renderer.render_to_string([], show_info=True, airport_info=airport_display_info)
+                lines = renderer.render_lines([], show_info=True, airport_info=airport_display_info)
             
-            lines = display_output.split('\n')
+            # Send only the rows that changed since the last frame, in one write
+            output = changed_rows([cached_colored_line(line, terminal_width, use_colors) for line in lines],
+                                  last_frame, terminal_height)
             try:
-                for i, line in enumerate(lines):
-                    output_line = process_colored_line(line, terminal_width, config.get('use_colors', True))
-                    if i == len(lines) - 1 and not line:
-                        continue
-                    writer.write(output_line)
-                await writer.drain()
+                if output:
+                    writer.write(output)
+                    await writer.drain()
             except Exception as e:
-                if config.get('debug', False):
+                if debug:
                     print(f"Error writing display output: {e}")
                 # Connection might be broken during resize
                 break
 
-            # Check for force update or sleep
-            if force_update.is_set():
-                force_update.clear()
-            else:
-                await asyncio.sleep(0.1 if app.demo_mode else 1.0)
+            # Wait out the frame, waking early when a key or resize forces an update.
+            # Keep a steady frame period by subtracting this frame's work.
+            if not force_update.is_set():
+                frame_period = 0.1 if app.demo_mode else 1.0
+                try:
+                    await asyncio.wait_for(force_update.wait(),
+                                           max(0, frame_period - (time.perf_counter() - frame_start)))
+                except asyncio.TimeoutError:
+                    pass
+            force_update.clear()
 
     except (ConnectionResetError, BrokenPipeError, OSError) as e:
         print(f"Client {peername} disconnected: {e}")
@@ -594,8 +789,9 @@ async def handle_terminal_session(reader, writer, speed, peername, protocol='tel
         traceback.print_exc()
     finally:
         print(f"Closing connection for {peername}")
-        rtask.cancel()
         input_task.cancel()
+        if fetch_task:
+            fetch_task.cancel()
         if not writer.is_closing():
             try:
                 writer.write("\x1b[?25h")  # Show cursor